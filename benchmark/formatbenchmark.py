@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from sys import path
+from os.path import dirname, abspath, join
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from timeit import repeat
+
+from seecr.zulutime import ZuluTime
+
+
+def best(stmt, number=10):
+    return min(repeat(stmt, number=number, repeat=3)) / number
+
+def main():
+    epochs = list(range(1426596781, 1426596781 + 10000 * 37, 37))
+    print("%-10s %14s %14s %8s" % ('format', 'objects us', 'formatMany us', 'speedup'))
+    for format in ['zulu', 'iso8601', 'rfc1123', 'rfc2822']:
+        objects = best(lambda: [getattr(ZuluTime(epoch), format)() for epoch in epochs]) / len(epochs) * 1e6
+        many = best(lambda: ZuluTime.formatMany(epochs, format=format)) / len(epochs) * 1e6
+        print("%-10s %14.2f %14.2f %7.1fx" % (format, objects, many, objects / many))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from sys import path
+from os.path import dirname, abspath, join
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from tracemalloc import start, stop, take_snapshot
+
+from seecr.zulutime import ZuluTime
+
+
+def bytesPerInstance(create, count=100000):
+    start()
+    before = take_snapshot()
+    instances = [create(i) for i in range(count)]
+    after = take_snapshot()
+    stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return (allocated - 8 * count) / count  # minus the list slots
+
+def main():
+    print("%-28s %10.1f" % ('ZuluTime(epoch)', bytesPerInstance(lambda i: ZuluTime(1426596781 + i))))
+    print("%-28s %10.1f" % ('ZuluTime(zulu string)', bytesPerInstance(lambda i: ZuluTime('2015-03-17T12:%02d:%02dZ' % divmod(i % 3600, 60)))))
+    print("%-28s %10.1f" % ('datetime (for reference)', bytesPerInstance(lambda i: ZuluTime(1426596781 + i)._)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from sys import path
+from os.path import dirname, abspath, join
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from timeit import repeat
+
+from seecr.zulutime import ZuluTime
+from seecr.zulutime._zulutime import _TimeZone
+
+
+INPUTS = [
+    '2012-09-06T23:27:11Z',
+    '2012-09-06T23:27:11.123456789Z',
+    '2012-09-06T23:27:11',
+    '2012-09-06 23:27:11',
+    '2012-09-06',
+    '2020-12-21T01:42:24.403578+01:00',
+    '2011-01-13T16:59:59 CET',
+    'Mon, 20 Nov 1995 21:12:08 +0200',
+    'Thu Jan 13 00:59:59 CET 2011',
+    '20120906232711',
+    1510240477.14,
+]
+
+def best(stmt, number=20000):
+    return min(repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+def main():
+    someTime = ZuluTime()
+    print("%-36s %12s %12s %8s" % ('input', 'cascade us', 'scan us', 'speedup'))
+    for input in INPUTS:
+        cascade = best(lambda: someTime._parseCascade(input, timezone=None))
+        scan = best(lambda: someTime._parse(input, timezone=None))
+        print("%-36s %12.2f %12.2f %7.1fx" % (str(input), cascade, scan, cascade / scan))
+    variedOffsets()
+
+def variedOffsets(blocks=10, blockSize=100000):
+    """Parse time and registry size must stay flat with ever new offsets."""
+    print("\n%-8s %12s %12s" % ('block', 'us/parse', 'registered'))
+    i = 0
+    for block in range(blocks):
+        inputs = []
+        for _ in range(blockSize):
+            hours, minutes = divmod(i % (24 * 60), 60)
+            inputs.append("2012-09-06T23:27:11%s%02d:%02d" % ('-+'[i % 2], hours, minutes))
+            i += 1
+        t = min(repeat(lambda: [ZuluTime(input) for input in inputs], number=1, repeat=1)) / blockSize * 1e6
+        print("%-8d %12.2f %12d" % (block, t, len(_TimeZone.registered)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+
+from sys import path, argv
+from os.path import dirname, abspath, join
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+import sys
+from os import cpu_count
+from threading import Thread, Barrier
+from time import perf_counter
+
+from seecr.zulutime import ZuluTime
+from seecr.zulutime._zulutime import _FREE_THREADED, _speedups
+
+
+INPUTS = ['2012-09-%02dT%02d:27:11%s' % (1 + i % 28, i % 24, ['Z', '+02:00', '.403578Z', ' CET'][i % 4]) for i in range(1000)]
+
+def throughput(threads, rounds):
+    """ZuluTime(str).zulu() per second, with threads each converting INPUTS rounds times."""
+    start = Barrier(threads + 1)
+    def work():
+        start.wait()
+        for _ in range(rounds):
+            for input in INPUTS:
+                ZuluTime(input).zulu()
+    workers = [Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    started = perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * rounds * len(INPUTS) / (perf_counter() - started)
+
+def main(maxThreads=None, rounds=20):
+    maxThreads = maxThreads or cpu_count() or 1
+    gil = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print("free-threaded build: %s, GIL enabled: %s, _speedups: %s, cpus: %s" % (_FREE_THREADED, gil, _speedups is not None, cpu_count()))
+    print("%8s %14s %9s %11s" % ('threads', 'conversions/s', 'speedup', 'efficiency'))
+    single = None
+    threads = 1
+    while threads <= maxThreads:
+        rate = max(throughput(threads, rounds) for _ in range(3))
+        single = single or rate
+        print("%8d %14.0f %8.2fx %10.0f%%" % (threads, rate, rate / single, rate / single / threads * 100))
+        threads *= 2
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in argv[1:]])
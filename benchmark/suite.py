@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from sys import path, argv, exit, version
+from os.path import dirname, abspath, join
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from argparse import ArgumentParser
+from json import dump, load
+from random import Random
+from timeit import Timer
+from tracemalloc import start, stop, reset_peak, get_traced_memory
+import sys
+
+from seecr.zulutime import ZuluTime, Zone
+from seecr.zulutime import _zulutime
+
+
+def cases():
+    """[(name, operation)] covering every input format, output method, add, epoch and sorting."""
+    t = ZuluTime('2012-09-06T23:27:11.403578Z')
+    random = Random(17)
+    unsorted = [ZuluTime(1346974031 + random.randrange(10 ** 8)) for i in range(1000)]
+    result = [('parse %s' % name, (lambda input: lambda: ZuluTime(input))(input)) for name, input in [
+        ('zulu', '2012-09-06T23:27:11Z'),
+        ('zulu fraction', '2012-09-06T23:27:11.123456789Z'),
+        ('iso8601 local', '2012-09-06T23:27:11'),
+        ('iso8601 space', '2012-09-06 23:27:11'),
+        ('iso8601 date', '2012-09-06'),
+        ('iso8601 offset', '2020-12-21T01:42:24.403578+01:00'),
+        ('iso8601 tzname', '2011-01-13T16:59:59 CET'),
+        ('iso8601 zone', '2012-09-06T23:27:11 Europe/Amsterdam'),
+        ('iso8601 basic', '20120906232711'),
+        ('rfc2822', 'Mon, 20 Nov 1995 21:12:08 +0200'),
+        ('java default', 'Thu Jan 13 00:59:59 CET 2011'),
+        ('epoch int', 1510240477),
+        ('epoch float', 1510240477.14),
+    ]]
+    amsterdam = Zone('Europe/Amsterdam')
+    result.extend([
+        ('format iso8601', t.iso8601),
+        ('format iso8601 zone', lambda: t.iso8601(amsterdam)),
+        ('format zulu', t.zulu),
+        ('format rfc2822', t.rfc2822),
+        ('format rfc1123', t.rfc1123),
+        ('format local', t.local),
+        ('format formatDutch', lambda: t.formatDutch(time=True)),
+        ('add months', lambda: t.add(months=1)),
+        ('add days', lambda: t.add(days=1)),
+        ('epoch', lambda: t.epoch),
+        ('sort 1000', lambda: sorted(unsorted)),
+    ])
+    return result
+
+def relativeSpeed(operation, seconds, repeats):
+    """(ops per second, speed relative to calibration): the best of repeats and the median of the
+    ratios of repeats in which calibration ran right before operation, so both saw the same machine."""
+    timer, number = _timer(operation, seconds)
+    reference, referenceNumber = _timer(calibration, seconds / 5)
+    times, ratios = [], []
+    for _ in range(repeats):
+        referenceTime = reference.timeit(referenceNumber)
+        times.append(timer.timeit(number))
+        ratios.append((number / times[-1]) / (referenceNumber / referenceTime))
+    return number / min(times), sorted(ratios)[len(ratios) // 2]
+
+def _timer(operation, seconds):
+    """(Timer, number of runs of operation taking at least seconds)"""
+    timer = Timer(operation)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= seconds / 10:
+            break
+        number *= 10
+    return timer, max(1, int(number * seconds / elapsed))
+
+def peakBytes(operation, number=20, repeats=3):
+    """Memory operation needs while running, results not kept; the least of repeats, as with time."""
+    operation()
+    start()
+    try:
+        peaks = []
+        for _ in range(repeats):
+            before = get_traced_memory()[0]
+            reset_peak()
+            for _ in range(number):
+                operation()
+            peaks.append(get_traced_memory()[1] - before)
+        return min(peaks)
+    finally:
+        stop()
+
+def calibration():
+    """Fixed pure Python work, measured next to every case so results of machines, or of moments
+    at which a shared machine runs slower, can be compared by their ratio to it."""
+    return sorted(str(i * 7919 % 1000) for i in range(100))
+
+def run(seconds=0.05, repeats=5, select=None, names=None):
+    results = {}
+    for name, operation in cases():
+        if select and select not in name or names is not None and name not in names:
+            continue
+        ops, relative = relativeSpeed(operation, seconds, repeats)
+        results[name] = {
+            'opsPerSecond': round(ops, 1),
+            'relative': round(relative, 4),
+            'peakBytes': peakBytes(operation),
+        }
+    return {
+        'python': version.split()[0],
+        'speedups': _zulutime._speedups is not None,
+        'results': results,
+    }
+
+def regressions(report, baseline, threshold):
+    """Messages for results slower, or needing more memory, than baseline by more than threshold (0.2 is 20%).
+
+    Speed is compared relative to the calibration work."""
+    messages = []
+    for name, result in sorted(report['results'].items()):
+        expected = baseline['results'].get(name)
+        if expected is None:
+            continue
+        if _slower(result, expected, threshold):
+            messages.append("%s: %.0f ops/s, %.1f%% of baseline" % (name, result['opsPerSecond'], 100 * result['relative'] / expected['relative']))
+        if _larger(result, expected, threshold):
+            messages.append("%s: %d peak bytes, baseline %d" % (name, result['peakBytes'], expected['peakBytes']))
+    return messages
+
+def confirmed(report, baseline, threshold, seconds, rounds=3):
+    """report with the cases that look slower, or larger, than baseline measured again, for longer,
+    up to rounds times, keeping their best results; a moment at which a shared machine runs slower is
+    no regression, a case that became slower stays slow in every round."""
+    for _ in range(rounds):
+        suspects = [name for name, result in report['results'].items() if name in baseline['results'] and (
+            _slower(result, baseline['results'][name], threshold) or _larger(result, baseline['results'][name], threshold))]
+        if not suspects:
+            break
+        for name, result in run(seconds=4 * seconds, names=suspects)['results'].items():
+            best = report['results'][name]
+            if result['relative'] > best['relative']:
+                best = dict(best, opsPerSecond=result['opsPerSecond'], relative=result['relative'])
+            report['results'][name] = dict(best, peakBytes=min(result['peakBytes'], best['peakBytes']))
+    return report
+
+def _slower(result, expected, threshold):
+    return result['relative'] < expected['relative'] * (1 - threshold)
+
+def _larger(result, expected, threshold):
+    return result['peakBytes'] > expected['peakBytes'] * (1 + threshold) + 512
+
+def main(args):
+    parser = ArgumentParser(description="Measures ZuluTime hot paths and compares them with a baseline. "
+        "Refresh the stored baseline with: suite.py --output benchmark/baseline.json")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    parser.add_argument('--baseline', help="JSON report to compare with; exits with 1 on regressions")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown as a fraction, default 0.2")
+    parser.add_argument('--seconds', type=float, default=0.05, help="minimum time per measurement, default 0.05")
+    parser.add_argument('--select', help="only cases with this text in their name")
+    options = parser.parse_args(args)
+    report = run(seconds=options.seconds, select=options.select)
+    baseline = None
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = load(f)
+        report = confirmed(report, baseline, options.threshold, options.seconds)
+    if options.output:
+        with open(options.output, 'w') as f:
+            dump(report, f, indent=2, sort_keys=True)
+    else:
+        dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+    if baseline is not None:
+        if baseline.get('speedups') != report['speedups'] or baseline.get('python') != report['python']:
+            print("warning: baseline is from python %s, speedups %s" % (baseline.get('python'), baseline.get('speedups')), file=sys.stderr)
+        messages = regressions(report, baseline, options.threshold)
+        for message in messages:
+            print("regression: " + message, file=sys.stderr)
+        return 1 if messages else 0
+    return 0
+
+if __name__ == '__main__':
+    exit(main(argv[1:]))
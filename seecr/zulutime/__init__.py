@@ -22,5 +22,9 @@
 #
 ## end license ##
 
-from ._zulutime import ZuluTime, TimeError, UTC, Local
+from ._zulutime import ZuluTime, TimeError, UTC, Local, Zone, Clock
+from ._scan import scan, seekTo
+from ._bulk import convertBulk
+from ._ndjson import normalizeNdjson
+from ._buckets import bucketize
 
@@ -0,0 +1,61 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from array import array
+from bisect import bisect_right
+from math import floor
+
+from ._zulutime import ZuluTime, UTC, _importNumpy, _parseStep, _stepStart, _MICROS_PER_SECOND
+
+
+def bucketize(epochs, unit, timezone=None):
+    """Returns (boundaries, indices) for epochs (seconds) in buckets of unit in timezone (UTC by default).
+
+    unit is a step of ZuluTime.range of at least a second, like '15min', '1d' or '1M'; boundaries
+    are the epochs at which the buckets start, from the one of the earliest epoch up to the one of
+    the latest, and indices the bucket of every epoch. Boundaries are computed once and epochs
+    assigned by binary search: with NumPy both are int64 arrays (numpy.searchsorted), otherwise a
+    list and an array('q') (bisect)."""
+    count, unitName = _parseStep(unit)
+    if unitName in ('us', 'ms'):
+        raise ValueError("unit must be at least a second, got %r" % (unit,))
+    timezone = timezone or UTC
+    if not hasattr(epochs, '__len__'):
+        epochs = list(epochs)
+    numpy = _importNumpy()
+    if numpy is not None:
+        values = numpy.asarray(epochs)
+        if not len(values):
+            return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+        boundaries = numpy.array(_boundaries(values.min(), values.max(), count, unitName, timezone), dtype=numpy.int64)
+        return boundaries, numpy.searchsorted(boundaries, values, side='right').astype(numpy.int64) - 1
+    if not len(epochs):
+        return [], array('q')
+    boundaries = _boundaries(min(epochs), max(epochs), count, unitName, timezone)
+    return boundaries, array('q', (bisect_right(boundaries, epoch) - 1 for epoch in epochs))
+
+def _boundaries(low, high, count, unit, timezone):
+    first = ZuluTime._fromMicros(_stepStart(floor(low) * _MICROS_PER_SECOND, count, unit, timezone), timezone)
+    last = ZuluTime._fromMicros((floor(high) + 1) * _MICROS_PER_SECOND, timezone)
+    return [t._micros // _MICROS_PER_SECOND for t in ZuluTime.range(first, last, '%d%s' % (count, unit))]
@@ -0,0 +1,90 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from os import cpu_count
+
+from ._zulutime import ZuluTime, TimeError
+
+
+def convertBulk(iterable, output='zulu', workers=None, chunksize=10000, timezone=None):
+    """Yields (result, error) for every value of iterable, in order.
+
+    result is ZuluTime(value, timezone) rendered as output ('zulu', 'iso8601', 'rfc1123',
+    'rfc2822' or 'epoch'), error None; or result is None and error the message of the
+    TimeError, 'no time' for None and other values that are not str, int or float. Chunks
+    of chunksize values are converted by a pool of workers processes (one per cpu by
+    default, workers=1 converts in this process). At most two chunks per worker are in
+    flight, so memory stays bounded and iterable may be endless."""
+    if output not in _OUTPUTS:
+        raise ValueError("output must be one of %s" % ', '.join(sorted(_OUTPUTS)))
+    workers = workers or cpu_count() or 1
+    chunks = _chunks(iterable, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _convertChunk(chunk, output, timezone)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_convertChunk, chunk, output, timezone))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+def _chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def _convertChunk(chunk, output, timezone):
+    render = _OUTPUTS[output]
+    results = []
+    for value in chunk:
+        if not isinstance(value, (str, int, float)):  # ZuluTime(None) would be now
+            results.append((None, 'no time'))
+            continue
+        try:
+            results.append((render(ZuluTime(value, timezone=timezone)), None))
+        except (TimeError, ValueError, OverflowError) as e:
+            results.append((None, str(e)))
+    return results
+
+_OUTPUTS = {
+    'zulu': lambda t: t.zulu(),
+    'iso8601': lambda t: t.iso8601(),
+    'rfc1123': lambda t: t.rfc1123(),
+    'rfc2822': lambda t: t.rfc2822(),
+    'epoch': lambda t: t.epoch,
+}
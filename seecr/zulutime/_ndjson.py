@@ -0,0 +1,100 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import asyncio
+from json import loads
+
+from ._zulutime import ZuluTime, TimeError
+from ._bulk import _OUTPUTS
+
+
+async def normalizeNdjson(stream, fields, output='zulu', timezone=None, batchSize=1000, maxLineLength=1 << 20, executor=None):
+    """Async generator of the records of an NDJSON byte stream, with the values at fields normalised.
+
+    stream is an async iterable of bytes chunks, like aiohttp's response.content.iter_any().
+    fields are paths like 'header.datestamp', stepping into lists on the way; a value there
+    becomes ZuluTime(value, timezone) rendered as output ('zulu', 'epoch', ...) and is left
+    as is when it is no time. The complete lines of every chunk are decoded and converted
+    right away, at most batchSize at a time, in executor (the loop's default when None), so
+    a trickling stream is not held back and the event loop is never blocked for long; no
+    more than the lines of one chunk and one partial line of at most maxLineLength bytes
+    are held."""
+    if output not in _OUTPUTS:
+        raise ValueError("output must be one of %s" % ', '.join(sorted(_OUTPUTS)))
+    paths = [tuple(field.split('.')) for field in fields]
+    loop = asyncio.get_running_loop()
+    partial, partialLength = [], 0  # pieces of the line not ended yet
+    async for chunk in stream:
+        lines = chunk.split(b'\n')
+        if len(lines) > 1 and partial:
+            lines[0] = b''.join(partial) + lines[0]
+            partial, partialLength = [], 0
+        last = lines.pop()
+        if last:
+            partial.append(last)
+            partialLength += len(last)
+            if partialLength > maxLineLength:
+                raise ValueError("line longer than %d bytes" % maxLineLength)
+        for start in range(0, len(lines), batchSize):
+            for record in await loop.run_in_executor(executor, _normalizeBatch, lines[start:start + batchSize], paths, output, timezone):
+                yield record
+    if partial:
+        for record in await loop.run_in_executor(executor, _normalizeBatch, [b''.join(partial)], paths, output, timezone):
+            yield record
+
+def _normalizeBatch(lines, paths, output, timezone):
+    render = _OUTPUTS[output]
+    records = []
+    for line in lines:
+        if not line.strip():
+            continue
+        record = loads(line)
+        for path in paths:
+            _normalize(record, path, render, timezone)
+        records.append(record)
+    return records
+
+def _normalize(container, path, render, timezone):
+    if isinstance(container, list):
+        for item in container:
+            _normalize(item, path, render, timezone)
+        return
+    if not isinstance(container, dict) or path[0] not in container:
+        return
+    if len(path) > 1:
+        _normalize(container[path[0]], path[1:], render, timezone)
+        return
+    value = container[path[0]]
+    if isinstance(value, list):
+        container[path[0]] = [_convert(item, render, timezone) for item in value]
+    else:
+        container[path[0]] = _convert(value, render, timezone)
+
+def _convert(value, render, timezone):
+    if not isinstance(value, (str, int, float)) or value.__class__ is bool:  # ZuluTime(None) would be now
+        return value
+    try:
+        return render(ZuluTime(value, timezone=timezone))
+    except (TimeError, ValueError, OverflowError):
+        return value
@@ -0,0 +1,128 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import re
+from mmap import mmap, ACCESS_READ
+from os import fspath
+
+from ._zulutime import ZuluTime, TimeError
+
+
+def scan(fileobjOrPath, format=None):
+    """Yields (offset, epoch) for every line containing a timestamp, offset being where the line starts.
+
+    The file is memory mapped and only the timestamp itself is decoded; format is
+    'iso8601' (which includes Zulu), 'rfc2822' or None for both."""
+    pattern = _pattern(format)
+    with _Mapped(fileobjOrPath) as data:
+        position = 0
+        while True:
+            found = _nextStamp(data, position, pattern)
+            if found is None:
+                return
+            offset, micros, position = found
+            yield offset, micros // 1000000
+
+def seekTo(fileobjOrPath, zuluTime, format=None):
+    """Byte offset of the first line stamped at or after zuluTime, in a file sorted by time.
+
+    Binary search on the memory mapped file; returns the file size if there is no such line."""
+    pattern = _pattern(format)
+    target = zuluTime._micros
+    with _Mapped(fileobjOrPath) as data:
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            found = _nextStamp(data, _lineStart(data, middle), pattern)
+            if found is None or found[1] >= target:
+                high = middle
+            else:
+                low = middle + 1
+        found = _nextStamp(data, _lineStart(data, low), pattern)
+        return len(data) if found is None else found[0]
+
+def _nextStamp(data, position, pattern):
+    """(line offset, epoch microseconds, next line offset) of the first stamped line from position."""
+    size = len(data)
+    while position < size:
+        end = data.find(b'\n', position)
+        end = size if end == -1 else end + 1
+        match = pattern.search(data, position, end)
+        if match is not None:
+            stamp = match.group()
+            if stamp[10:11] == b' ' and stamp[4:5] == b'-':
+                stamp = stamp[:10] + b'T' + stamp[11:]  # ZuluTime only accepts a space without zone
+            try:
+                return position, ZuluTime(stamp.decode('ascii'))._micros, end
+            except TimeError:
+                pass
+        position = end
+    return None
+
+def _lineStart(data, position):
+    if position == 0:
+        return 0
+    newline = data.find(b'\n', position - 1)
+    return len(data) if newline == -1 else newline + 1
+
+def _pattern(format):
+    try:
+        return _PATTERNS[format]
+    except KeyError:
+        raise ValueError("format must be one of 'iso8601', 'rfc2822' or None")
+
+
+class _Mapped(object):
+    def __init__(self, fileobjOrPath):
+        self._fileobjOrPath = fileobjOrPath
+        self._file = self._map = None
+
+    def __enter__(self):
+        source = self._fileobjOrPath
+        if not hasattr(source, 'read'):
+            source = self._file = open(fspath(source), 'rb')
+        try:
+            fileno = source.fileno()
+        except (AttributeError, OSError, ValueError):
+            return source.read()
+        try:
+            self._map = mmap(fileno, 0, access=ACCESS_READ)
+        except ValueError:  # empty file
+            return b''
+        return self._map
+
+    def __exit__(self, *exc_info):
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+
+_ISO8601_BYTES = rb'[0-9]{4}-[0-9]{2}-[0-9]{2}[T ][0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]+)?(?:Z|[+-][0-9]{2}(?::?[0-9]{2})?)?'
+_RFC2822_BYTES = rb'(?:[A-Z][a-z]{2}, )?[0-9]{1,2} [A-Z][a-z]{2} [0-9]{4} [0-9]{2}:[0-9]{2}(?::[0-9]{2})? (?:[+-][0-9]{4}|[A-Z]{1,5})'
+_PATTERNS = {
+    None: re.compile(_ISO8601_BYTES + rb'|' + _RFC2822_BYTES),
+    'iso8601': re.compile(_ISO8601_BYTES),
+    'rfc2822': re.compile(_RFC2822_BYTES),
+}
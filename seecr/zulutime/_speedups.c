@@ -0,0 +1,365 @@
+/* begin license *
+ *
+ * Zulutime helps formatting and parsing timestamps.
+ *
+ * Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+ *
+ * This file is part of "Zulutime"
+ *
+ * "Zulutime" is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * "Zulutime" is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with "Zulutime"; if not, write to the Free Software
+ * Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+ *
+ * end license */
+
+/* Optional accelerator for _zulutime.py; every function has a pure Python
+ * equivalent there, which is used when this module is not built.
+ *
+ * Times are wall clock microseconds since 1970-01-01 in the proleptic
+ * Gregorian calendar, limited to the years 1..9999 like datetime. */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#define MICROS_PER_SECOND 1000000LL
+#define MICROS_PER_DAY (86400LL * MICROS_PER_SECOND)
+#define MIN_DAYS (-719162LL)  /* 0001-01-01 */
+#define MAX_DAYS 2932897LL    /* 10000-01-01 */
+
+typedef struct {
+    int year, month, day, hour, minute, second, microsecond, weekday;
+} Civil;
+
+static const char *WEEKDAYS[] = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"};
+static const char *MONTHS[] = {NULL, "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"};
+static const int DAYS_IN_MONTH[] = {0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31};
+
+static long long floorDiv(long long a, long long b) {
+    long long q = a / b;
+    return (a % b != 0 && (a < 0) != (b < 0)) ? q - 1 : q;
+}
+
+/* _daysFromCivil in _zulutime.py */
+static long long daysFromCivil(long long year, int month, int day) {
+    long long era, yearOfEra, dayOfYear;
+    year -= month <= 2;
+    era = floorDiv(year, 400);
+    yearOfEra = year - era * 400;
+    dayOfYear = (153 * ((month + 9) % 12) + 2) / 5 + day - 1;
+    return era * 146097 + yearOfEra * 365 + yearOfEra / 4 - yearOfEra / 100 + dayOfYear - 719468;
+}
+
+/* _civilFromDays in _zulutime.py */
+static void civilFromDays(long long days, Civil *civil) {
+    long long era, dayOfEra, yearOfEra, dayOfYear, shiftedMonth;
+    days += 719468;
+    era = floorDiv(days, 146097);
+    dayOfEra = days - era * 146097;
+    yearOfEra = (dayOfEra - dayOfEra / 1460 + dayOfEra / 36524 - dayOfEra / 146096) / 365;
+    dayOfYear = dayOfEra - (365 * yearOfEra + yearOfEra / 4 - yearOfEra / 100);
+    shiftedMonth = (5 * dayOfYear + 2) / 153;
+    civil->month = (int)((shiftedMonth + 2) % 12 + 1);
+    civil->day = (int)(dayOfYear - (153 * shiftedMonth + 2) / 5 + 1);
+    civil->year = (int)(yearOfEra + era * 400 + (civil->month <= 2));
+}
+
+static int isLeap(int year) {
+    return year % 4 == 0 && (year % 100 != 0 || year % 400 == 0);
+}
+
+/* Fills civil from wall micros; -1 with OverflowError set when out of range. */
+static int splitWall(PyObject *wallObject, Civil *civil) {
+    long long wall, days, seconds, rest;
+    wall = PyLong_AsLongLong(wallObject);
+    if (wall == -1 && PyErr_Occurred())
+        return -1;
+    days = floorDiv(wall, MICROS_PER_DAY);
+    if (days < MIN_DAYS || days >= MAX_DAYS) {
+        PyErr_SetString(PyExc_OverflowError, "date value out of range");
+        return -1;
+    }
+    civilFromDays(days, civil);
+    rest = wall - days * MICROS_PER_DAY;
+    seconds = rest / MICROS_PER_SECOND;
+    civil->microsecond = (int)(rest % MICROS_PER_SECOND);
+    civil->hour = (int)(seconds / 3600);
+    civil->minute = (int)(seconds / 60 % 60);
+    civil->second = (int)(seconds % 60);
+    civil->weekday = (int)((days + 3) % 7 + 7) % 7;  /* 1970-01-01 was a Thursday */
+    return 0;
+}
+
+static char *put2(char *p, int value) {
+    *p++ = '0' + value / 10;
+    *p++ = '0' + value % 10;
+    return p;
+}
+
+static char *put4(char *p, int value) {
+    p = put2(p, value / 100);
+    return put2(p, value % 100);
+}
+
+static char *putText(char *p, const char *text) {
+    while (*text)
+        *p++ = *text++;
+    return p;
+}
+
+/* YYYY-MM-DDTHH:MM:SS, the 19 characters shared by the Zulu and ISO 8601 formats */
+static char *putIsoDateTime(char *p, const Civil *c) {
+    p = put4(p, c->year);
+    *p++ = '-';
+    p = put2(p, c->month);
+    *p++ = '-';
+    p = put2(p, c->day);
+    *p++ = 'T';
+    p = put2(p, c->hour);
+    *p++ = ':';
+    p = put2(p, c->minute);
+    *p++ = ':';
+    return put2(p, c->second);
+}
+
+static int checkArguments(const char *name, Py_ssize_t nargs, Py_ssize_t expected) {
+    if (nargs != expected) {
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly %zd arguments (%zd given)", name, expected, nargs);
+        return -1;
+    }
+    return 0;
+}
+
+PyDoc_STRVAR(civil_doc,
+"civil(wall, utcoffset, tzname)\n\n"
+"(year, month, day, hour, minute, second, microsecond, weekday, utcoffset, tzname) of wall micros.");
+
+static PyObject *civil(PyObject *module, PyObject *const *args, Py_ssize_t nargs) {
+    Civil c;
+    if (checkArguments("civil", nargs, 3) < 0 || splitWall(args[0], &c) < 0)
+        return NULL;
+    return Py_BuildValue("(iiiiiiiiOO)", c.year, c.month, c.day, c.hour, c.minute, c.second, c.microsecond, c.weekday, args[1], args[2]);
+}
+
+PyDoc_STRVAR(formatZulu_doc,
+"formatZulu(wall, tzname)\n\n"
+"Wall micros rendered as '%Y-%m-%dT%H:%M:%SZ'; tzname is not used.");
+
+static PyObject *formatZulu(PyObject *module, PyObject *const *args, Py_ssize_t nargs) {
+    Civil c;
+    char buffer[20], *p;
+    if (checkArguments("formatZulu", nargs, 2) < 0 || splitWall(args[0], &c) < 0)
+        return NULL;
+    p = putIsoDateTime(buffer, &c);
+    *p++ = 'Z';
+    return PyUnicode_FromStringAndSize(buffer, p - buffer);
+}
+
+PyDoc_STRVAR(formatIso8601_doc,
+"formatIso8601(wall, tzname)\n\n"
+"Wall micros rendered as '%Y-%m-%dT%H:%M:%S %Z' with tzname for %Z.");
+
+static PyObject *formatIso8601(PyObject *module, PyObject *const *args, Py_ssize_t nargs) {
+    Civil c;
+    char buffer[84], *p;
+    PyObject *tzname, *prefix, *result;
+    Py_ssize_t length;
+    if (checkArguments("formatIso8601", nargs, 2) < 0 || splitWall(args[0], &c) < 0)
+        return NULL;
+    tzname = args[1];
+    p = putIsoDateTime(buffer, &c);
+    *p++ = ' ';
+    if (tzname == Py_None)
+        return PyUnicode_FromStringAndSize(buffer, p - buffer);
+    if (!PyUnicode_Check(tzname)) {
+        PyErr_SetString(PyExc_TypeError, "tzname must be a str or None");
+        return NULL;
+    }
+    length = PyUnicode_GET_LENGTH(tzname);
+    if (PyUnicode_IS_ASCII(tzname) && length <= 64) {
+        memcpy(p, PyUnicode_DATA(tzname), length);
+        return PyUnicode_FromStringAndSize(buffer, p - buffer + length);
+    }
+    prefix = PyUnicode_FromStringAndSize(buffer, p - buffer);
+    if (prefix == NULL)
+        return NULL;
+    result = PyUnicode_Concat(prefix, tzname);
+    Py_DECREF(prefix);
+    return result;
+}
+
+PyDoc_STRVAR(formatRfc1123_doc,
+"formatRfc1123(wall, tzname)\n\n"
+"Wall micros rendered as '%a, %d %b %Y %H:%M:%S GMT'; tzname is not used.");
+
+static PyObject *formatRfc1123(PyObject *module, PyObject *const *args, Py_ssize_t nargs) {
+    Civil c;
+    char buffer[29], *p;
+    if (checkArguments("formatRfc1123", nargs, 2) < 0 || splitWall(args[0], &c) < 0)
+        return NULL;
+    p = putText(buffer, WEEKDAYS[c.weekday]);
+    *p++ = ',';
+    *p++ = ' ';
+    p = put2(p, c.day);
+    *p++ = ' ';
+    p = putText(p, MONTHS[c.month]);
+    *p++ = ' ';
+    p = put4(p, c.year);
+    *p++ = ' ';
+    p = put2(p, c.hour);
+    *p++ = ':';
+    p = put2(p, c.minute);
+    *p++ = ':';
+    p = put2(p, c.second);
+    p = putText(p, " GMT");
+    return PyUnicode_FromStringAndSize(buffer, p - buffer);
+}
+
+/* Reads count digits at s[*position]; -1 when they are not all there. */
+static int digits(const char *s, Py_ssize_t length, Py_ssize_t *position, int count) {
+    int value = 0;
+    if (*position + count > length)
+        return -1;
+    while (count--) {
+        char digit = s[(*position)++];
+        if (digit < '0' || digit > '9')
+            return -1;
+        value = value * 10 + digit - '0';
+    }
+    return value;
+}
+
+PyDoc_STRVAR(scanIso8601_doc,
+"scanIso8601(input)\n\n"
+"(wall micros, offset minutes or None) for the common ISO 8601 and Zulu layouts,\n"
+"None for anything else. Accepts only what ZuluTime._scanIso8601 accepts, with the\n"
+"same result; an offset is only meaningful when no timezone is given.");
+
+static PyObject *scanIso8601(PyObject *module, PyObject *input) {
+    const char *s;
+    Py_ssize_t length, position = 0;
+    int year, month, day, hour = 0, minute = 0, second = 0, microsecond = 0;
+    int hasSecond = 0, fractionLength = 0, hasOffset = 0, offsetMinutes = 0;
+    char sep = 0;
+    long long wall;
+
+    if (!PyUnicode_Check(input)) {
+        PyErr_SetString(PyExc_TypeError, "input must be a str");
+        return NULL;
+    }
+    if (!PyUnicode_IS_ASCII(input))
+        Py_RETURN_NONE;
+    s = (const char *)PyUnicode_DATA(input);
+    length = PyUnicode_GET_LENGTH(input);
+
+    if ((year = digits(s, length, &position, 4)) < 1 || position >= length || s[position++] != '-' ||
+            (month = digits(s, length, &position, 2)) < 0 || position >= length || s[position++] != '-' ||
+            (day = digits(s, length, &position, 2)) < 0)
+        Py_RETURN_NONE;
+    if (position < length && (s[position] == 'T' || s[position] == ' ')) {
+        sep = s[position++];
+        if ((hour = digits(s, length, &position, 2)) < 0 || position >= length || s[position++] != ':' ||
+                (minute = digits(s, length, &position, 2)) < 0)
+            Py_RETURN_NONE;
+        if (position < length && s[position] == ':') {
+            position++;
+            if ((second = digits(s, length, &position, 2)) < 0)
+                Py_RETURN_NONE;
+            hasSecond = 1;
+            if (position < length && s[position] == '.') {
+                position++;
+                while (position < length && s[position] >= '0' && s[position] <= '9') {
+                    if (fractionLength < 6)
+                        microsecond = microsecond * 10 + s[position] - '0';
+                    fractionLength++;
+                    position++;
+                }
+                if (fractionLength == 0)
+                    Py_RETURN_NONE;
+                for (int i = fractionLength; i < 6; i++)
+                    microsecond *= 10;
+            }
+        }
+    }
+    if (month < 1 || month > 12 || day < 1 || day > DAYS_IN_MONTH[month] + (month == 2 && isLeap(year)) ||
+            hour > 23 || minute > 59 || second > 59)
+        Py_RETURN_NONE;
+
+    if (position == length) {
+        /* no zone: a space only with seconds */
+        if (sep == ' ' && !hasSecond)
+            Py_RETURN_NONE;
+    }
+    else if (s[position] == 'Z' && position + 1 == length) {
+        /* Zulu: complete time required */
+        if (sep != 'T' || !hasSecond)
+            Py_RETURN_NONE;
+    }
+    else if (s[position] == '+' || s[position] == '-') {
+        /* numeric offset: +HH, +HHMM or +HH:MM */
+        int sign = s[position++] == '-' ? -1 : 1, offsetHours, extraMinutes = 0;
+        if (sep == ' ' || (offsetHours = digits(s, length, &position, 2)) < 0)
+            Py_RETURN_NONE;
+        if (position < length) {
+            if (s[position] == ':')
+                position++;
+            if ((extraMinutes = digits(s, length, &position, 2)) < 0 || position != length)
+                Py_RETURN_NONE;
+        }
+        offsetMinutes = offsetHours * 60 + extraMinutes;
+        if (offsetMinutes >= 24 * 60 || (offsetMinutes == 0 && sign < 0))
+            Py_RETURN_NONE;  /* -00:00 is left to Python, it has a timezone of its own */
+        offsetMinutes *= sign;
+        hasOffset = 1;
+    }
+    else
+        Py_RETURN_NONE;
+
+    wall = ((daysFromCivil(year, month, day) * 24 + hour) * 60 + minute) * 60 + second;
+    wall = wall * MICROS_PER_SECOND + microsecond;
+    if (hasOffset)
+        return Py_BuildValue("(Li)", wall, offsetMinutes);
+    return Py_BuildValue("(LO)", wall, Py_None);
+}
+
+static PyMethodDef methods[] = {
+    {"civil", (PyCFunction)(void (*)(void))civil, METH_FASTCALL, civil_doc},
+    {"formatZulu", (PyCFunction)(void (*)(void))formatZulu, METH_FASTCALL, formatZulu_doc},
+    {"formatIso8601", (PyCFunction)(void (*)(void))formatIso8601, METH_FASTCALL, formatIso8601_doc},
+    {"formatRfc1123", (PyCFunction)(void (*)(void))formatRfc1123, METH_FASTCALL, formatRfc1123_doc},
+    {"scanIso8601", scanIso8601, METH_O, scanIso8601_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+/* no module state and no static mutable data: safe in subinterpreters and without the GIL */
+static PyModuleDef_Slot slots[] = {
+#if PY_VERSION_HEX >= 0x030C0000
+    {Py_mod_multiple_interpreters, Py_MOD_PER_INTERPRETER_GIL_SUPPORTED},
+#endif
+#if PY_VERSION_HEX >= 0x030D0000
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    "_speedups",
+    "Compiled parse and format hot paths of seecr.zulutime.",
+    0,
+    methods,
+    slots,
+};
+
+PyMODINIT_FUNC PyInit__speedups(void) {
+    return PyModuleDef_Init(&module);
+}
@@ -0,0 +1,138 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import re
+from struct import unpack
+
+
+class TzifError(Exception): pass
+
+
+def readTzif(data):
+    """Returns (transitions, typeIndices, types, footer) from the bytes of a TZif file.
+
+    transitions are UTC seconds, typeIndices index types per transition, types are
+    (utcoffset seconds, isdst, abbreviation) and footer is the POSIX TZ string or ''."""
+    version, counts, offset = _header(data, 0)
+    if version >= b'2':
+        offset += _blockSize(counts, timeSize=4)
+        version, counts, offset = _header(data, offset)
+        timeFormat, timeSize = 'q', 8
+    else:
+        timeFormat, timeSize = 'l', 4
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+    transitions = list(unpack('>%d%s' % (timecnt, timeFormat), data[offset:offset + timecnt * timeSize]))
+    offset += timecnt * timeSize
+    typeIndices = list(data[offset:offset + timecnt])
+    offset += timecnt
+    rawTypes = [unpack('>lBB', data[offset + i * 6:offset + i * 6 + 6]) for i in range(typecnt)]
+    offset += typecnt * 6
+    chars = data[offset:offset + charcnt]
+    offset += charcnt + leapcnt * (timeSize + 4) + isstdcnt + isutcnt
+    types = [(utcoffset, bool(isdst), chars[index:chars.index(b'\0', index)].decode('ascii')) for (utcoffset, isdst, index) in rawTypes]
+    footer = ''
+    if version >= b'2':
+        end = data.find(b'\n', offset + 1)
+        if data[offset:offset + 1] == b'\n' and end > offset:
+            footer = data[offset + 1:end].decode('ascii')
+    return transitions, typeIndices, types, footer
+
+def _header(data, offset):
+    if data[offset:offset + 4] != b'TZif':
+        raise TzifError('Not a TZif file')
+    version = data[offset + 4:offset + 5]
+    counts = unpack('>6l', data[offset + 20:offset + 44])
+    return (b'1' if version == b'\0' else version), counts, offset + 44
+
+def _blockSize(counts, timeSize):
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+    return timecnt * timeSize + timecnt + typecnt * 6 + charcnt + leapcnt * (timeSize + 4) + isstdcnt + isutcnt
+
+
+class PosixRule(object):
+    """A POSIX TZ string such as 'CET-1CEST,M3.5.0,M10.5.0/3'."""
+
+    def __init__(self, string):
+        match = _POSIX_RE.match(string)
+        if match is None:
+            raise TzifError("Unsupported TZ string '%s'" % string)
+        groups = match.groupdict()
+        self.stdName = groups['std'].strip('<>')
+        self.stdOffset = -_seconds(groups['stdOffset'])
+        self.dstName = None
+        self.dstOffset = self.stdOffset
+        self._start = self._end = None
+        if groups['dst']:
+            self.dstName = groups['dst'].strip('<>')
+            self.dstOffset = -_seconds(groups['dstOffset']) if groups['dstOffset'] else self.stdOffset + 3600
+            if groups['start'] is None:
+                raise TzifError("Unsupported TZ string '%s'" % string)
+            self._start = (_date(groups['start']), _seconds(groups['startTime']) if groups['startTime'] else 7200)
+            self._end = (_date(groups['end']), _seconds(groups['endTime']) if groups['endTime'] else 7200)
+
+    def transitions(self, year, daysFromCivil):
+        """[(utc seconds, isdst)] for year, ordered; empty without daylight saving time."""
+        if self.dstName is None:
+            return []
+        (startDay, startTime), (endDay, endTime) = self._start, self._end
+        start = (daysFromCivil(year, 1, 1) + startDay(year, daysFromCivil)) * 86400 + startTime - self.stdOffset
+        end = (daysFromCivil(year, 1, 1) + endDay(year, daysFromCivil)) * 86400 + endTime - self.dstOffset
+        return sorted([(start, True), (end, False)])
+
+
+def _seconds(text):
+    sign = -1 if text.startswith('-') else 1
+    parts = [int(part) for part in text.lstrip('+-').split(':')] + [0, 0]
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+def _date(text):
+    """Function of (year, daysFromCivil) giving the zero based day of the year."""
+    if text.startswith('M'):
+        month, week, weekday = [int(part) for part in text[1:].split('.')]
+        def day(year, daysFromCivil):
+            first = daysFromCivil(year, month, 1)
+            day = first + (weekday - (first + 4)) % 7 + (week - 1) * 7  # 1970-01-01 was a Thursday
+            if week == 5:
+                nextMonth = daysFromCivil(year + month // 12, month % 12 + 1, 1)
+                while day >= nextMonth:
+                    day -= 7
+            return day - daysFromCivil(year, 1, 1)
+        return day
+    if text.startswith('J'):
+        julian = int(text[1:])
+        def day(year, daysFromCivil):
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            return julian - 1 + (1 if leap and julian > 59 else 0)
+        return day
+    zeroBased = int(text)
+    return lambda year, daysFromCivil: zeroBased
+
+_NAME = r'(?:[A-Za-z]{3,}|<[A-Za-z0-9+-]+>)'
+_OFFSET = r'[+-]?[0-9]{1,3}(?::[0-9]{2}){0,2}'
+_RULE_DATE = r'(?:M[0-9]{1,2}\.[1-5]\.[0-6]|J[0-9]{1,3}|[0-9]{1,3})'
+_POSIX_RE = re.compile(
+    r'(?P<std>%(name)s)(?P<stdOffset>%(offset)s)'
+    r'(?:(?P<dst>%(name)s)(?P<dstOffset>%(offset)s)?'
+    r'(?:,(?P<start>%(date)s)(?:/(?P<startTime>%(offset)s))?,(?P<end>%(date)s)(?:/(?P<endTime>%(offset)s))?)?)?\Z' % dict(
+        name=_NAME, offset=_OFFSET, date=_RULE_DATE))
@@ -23,47 +23,258 @@
 ## end license ##
 
 import re
-from time import mktime, localtime, tzname, timezone, altzone, daylight
+import time
+import operator
+from time import localtime
+from bisect import bisect_left, bisect_right
 from datetime import datetime, tzinfo, timedelta
 from email import utils as email
-from calendar import timegm
+from array import array
+from math import modf
+from os.path import join, isfile
+from threading import Lock, RLock, local
+from collections import OrderedDict
+from struct import Struct, error as StructError
+from sysconfig import get_config_var
+
+from ._tzif import readTzif, PosixRule, TzifError
+
+try:
+    from . import _speedups
+except ImportError:
+    _speedups = None
 
 
 class TimeError(Exception): pass
 
 
 class ZuluTime(object):
-    """Converts timestamps making sure time zone information is properly dealt with."""
+    """Converts timestamps making sure time zone information is properly dealt with.
+
+    ZuluTime(input) tries every known format; when the format is known in advance, parseZulu,
+    parseIso8601, parseRfc2822, parseRfc1123 and parseHttpDate are faster and strict."""
+
+    # microseconds since the epoch (UTC) and the timezone; a datetime is only built when needed
+    __slots__ = ('_micros', '_tz')
 
     def __init__(self, input=None, timezone=None, _=None):
         """Parses verious formats safely, without losing time zone information."""
-        if _ is not None:
-            self._ = _
-        elif input is None:
-            self._ = datetime.now(UTC)
-        else:
-            lastTimeError = None
-            for m in [
-                    self._parseIso8601,
-                    self._parseZulutimeFormat,
-                    self._parseLocalFormat,
-                    self._parseJavaDefaultDateFormat,
-                    self._parseRfc2822,
-                    self._parseIso8601BasicLocal,
-                    self._parseEpoch,
-                ]:
-                try:
-                    self._ = m(input, timezone=timezone)
-                    lastTimeError = None
-                    break
-                except TimeError as e:
-                    lastTimeError = e
-                except Exception:
-                    pass
+        if _ is None:
+            if input is None:
+                _ = datetime.now(UTC)
+            elif _parseCache is not None and input.__class__ is str:
+                self._micros, self._tz = _parseCache.lookup(input, timezone, self._parseMicros if _metrics is None else self._parseMeasured)
+                return
             else:
-                if not lastTimeError is None:
-                    raise lastTimeError
-                raise TimeError('Format unknown')
+                self._micros, self._tz = (self._parseMicros if _metrics is None else self._parseMeasured)(input, timezone=timezone)
+                return
+        self._micros = _microsSinceEpoch(_)
+        self._tz = _.tzinfo
+
+    @property
+    def _(self):
+        t = _EPOCH + timedelta(microseconds=self._micros)
+        return t if self._tz is UTC else t.astimezone(self._tz)
+
+    def __getstate__(self):
+        return (self._micros, self._tz)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):  # pickled before __slots__
+            tz = _legacyTimeZone(state['_'].tzinfo)
+            state = (_microsSinceEpoch(state['_'].replace(tzinfo=tz)), tz)
+        self._micros, self._tz = state
+
+    def __reduce__(self):
+        if self.__class__ is ZuluTime:
+            return (_zuluTime, (self._micros, self._tz))
+        return (_zuluTime, (self._micros, self._tz, self.__class__))
+
+    def toBytes(self):
+        """Compact binary form: int64 epoch micros and int16 offset minutes or zone code, big endian,
+        followed by the name for a Zone; 10 bytes for UTC and fixed offsets. Also fits msgpack ExtType."""
+        tz = self._tz
+        if tz is UTC:
+            return _WIRE.pack(self._micros, _WIRE_UTC)
+        if tz is Local:
+            return _WIRE.pack(self._micros, _WIRE_LOCAL)
+        if tz is _NEGATIVE_ZERO_OFFSET:
+            return _WIRE.pack(self._micros, _WIRE_NEGATIVE_ZERO)
+        if tz.__class__ is Zone:
+            return _WIRE.pack(self._micros, _WIRE_ZONE) + tz.name.encode('ascii')
+        if tz.__class__ is _TimeZone and _TimeZone._byName.get(tz.name) is tz:
+            return _WIRE.pack(self._micros, _WIRE_REGISTERED) + tz.name.encode('utf-8')
+        offset = tz.utcoffset(None)
+        if isinstance(tz, (_FixedOffsetTimeZone, _OffsetOnlyTimeZone)) and offset % _ONE_MINUTE == _NO_TIME_DELTA and abs(offset) < _ONE_DAY:
+            return _WIRE.pack(self._micros, offset // _ONE_MINUTE)
+        raise TimeError("No compact form for timezone %r" % (tz,))
+
+    @classmethod
+    def fromBytes(cls, data):
+        """The ZuluTime of toBytes()."""
+        try:
+            micros, code = _WIRE.unpack_from(data)
+        except (StructError, TypeError):
+            raise TimeError("Not a ZuluTime in bytes: %r" % (data,))
+        name = bytes(data[_WIRE.size:])
+        tz = None
+        if -_MAX_OFFSET_MINUTES < code < _MAX_OFFSET_MINUTES and not name:
+            tz = _fixedOffsetTimeZone(code)
+        elif code == _WIRE_UTC and not name:
+            tz = UTC
+        elif code == _WIRE_LOCAL and not name:
+            tz = Local
+        elif code == _WIRE_NEGATIVE_ZERO and not name:
+            tz = _NEGATIVE_ZERO_OFFSET
+        elif code == _WIRE_ZONE and name:
+            tz = _zoneByName(name.decode('ascii', 'replace'))
+        elif code == _WIRE_REGISTERED and name:
+            tz = _TimeZone._byName.get(name.decode('utf-8', 'replace'))
+        if tz is None or not _MIN_MICROS <= micros < _MAX_MICROS:
+            raise TimeError("Not a ZuluTime in bytes: %r" % (data,))
+        return cls._fromMicros(micros, tz)
+
+    @staticmethod
+    def toArrow(times, timezone=None):
+        """A pyarrow timestamp[us, tz] array of times (None for null), tz being that of timezone or else
+        of the first time: 'UTC', an offset like '+02:00' or a Zone name."""
+        pyarrow = _importPyarrow()
+        if pyarrow is None:
+            raise ImportError("toArrow requires pyarrow")
+        times = list(times)
+        if timezone is None:
+            timezone = next((t._tz for t in times if t is not None), UTC)
+        return pyarrow.array([None if t is None else t._micros for t in times], type=pyarrow.timestamp('us', tz=_arrowTimezone(timezone)))
+
+    @classmethod
+    def fromArrow(cls, array):
+        """[ZuluTime or None] of a pyarrow timestamp array, in its timezone (UTC when it has none)."""
+        pyarrow = _importPyarrow()
+        if pyarrow is None:
+            raise ImportError("fromArrow requires pyarrow")
+        tz = _timezoneFromArrow(array.type.tz)
+        if array.type.unit != 'us':
+            array = array.cast(pyarrow.timestamp('us', tz=array.type.tz))
+        return [None if micros is None else cls._fromMicros(micros, tz) for micros in array.cast(pyarrow.int64()).to_pylist()]
+
+    def _parseMicros(self, input, timezone):
+        """(epoch micros, timezone) for input, skipping datetime when _speedups recognises it."""
+        if _speedups is not None and input.__class__ is str:
+            result = self._speedupsScan(input, timezone)
+            if result is not None:
+                return result
+        if input.__class__ is int and _MIN_MICROS <= input * _MICROS_PER_SECOND < _MAX_MICROS:
+            if _metrics is not None:
+                _metrics.accepted('_parseEpoch', 0)
+            return input * _MICROS_PER_SECOND, timezone or UTC  # as _parseEpoch, without float
+        t = self._parse(input, timezone=timezone)
+        return _microsSinceEpoch(t), t.tzinfo
+
+    @staticmethod
+    def _speedupsScan(input, timezone):
+        """(epoch micros, timezone) when _speedups.scanIso8601 settles input, else None."""
+        scanned = _speedups.scanIso8601(input)
+        if scanned is not None:
+            wall, minutes = scanned
+            if minutes is None:
+                timezone = timezone or UTC
+                return _utcFromWall(wall, timezone), timezone
+            if timezone is None:
+                timezone = _fixedOffsetTimeZone(minutes)
+                return _utcFromWall(wall, timezone), timezone
+        return None
+
+    def _parseMeasured(self, input, timezone):
+        metrics = _metrics
+        if metrics is None:
+            return self._parseMicros(input, timezone=timezone)
+        return metrics.measure(self._parseMicros, input, timezone)
+
+    def _parse(self, input, timezone):
+        if input.__class__ is str:
+            result = self._scanIso8601(input, timezone=timezone)
+            if result is not None:
+                return result
+        format = self.detectFormat(input)
+        if format is None:
+            return self._parseCascade(input, timezone=timezone)
+        return self._parseCascade(input, timezone=timezone, parsers=[getattr(self, name) for name in _CANDIDATE_PARSERS[format]])
+
+    def _parseCascade(self, input, timezone, parsers=None):
+        lastTimeError = None
+        for attempt, m in enumerate(parsers or [
+                self._parseIso8601,
+                self._parseZulutimeFormat,
+                self._parseLocalFormat,
+                self._parseJavaDefaultDateFormat,
+                self._parseRfc2822,
+                self._parseIso8601BasicLocal,
+                self._parseEpoch,
+            ]):
+            try:
+                result = m(input, timezone=timezone)
+            except TimeError as e:
+                lastTimeError = e
+                continue
+            except Exception:
+                continue
+            if _metrics is not None:
+                _metrics.accepted(m.__name__, attempt)
+            return result
+        if not lastTimeError is None:
+            raise lastTimeError
+        raise TimeError('Format unknown')
+
+    @staticmethod
+    def configureParseCache(maxsize=1024, threadSafe=False):
+        """Enables (maxsize > 0) or disables (maxsize=0) the process wide cache of parsed strings.
+
+        The cache is a LRU keyed on (input, timezone); threadSafe guards it with a lock, as is
+        always done on free-threaded builds."""
+        global _parseCache
+        _parseCache = _ParseCache(maxsize, threadSafe) if maxsize > 0 else None
+
+    @staticmethod
+    def parseCacheStatistics():
+        """Counters of the parse cache, None when it is disabled."""
+        return None if _parseCache is None else _parseCache.statistics()
+
+    @staticmethod
+    def configureMetrics(enabled=True):
+        """Starts, with fresh counters, or stops (enabled=False) collecting metrics of parsing.
+
+        Parses answered by the parse cache are not counted."""
+        global _metrics
+        _metrics = _Metrics() if enabled else None
+
+    @staticmethod
+    def metricsSnapshot():
+        """Counters and latency histograms per parser as a dict, None when metrics are disabled."""
+        return None if _metrics is None else _metrics.snapshot()
+
+    @staticmethod
+    def metricsPrometheus():
+        """The metrics in the Prometheus text exposition format, '' when disabled."""
+        return '' if _metrics is None else _metrics.prometheus()
+
+    @staticmethod
+    def detectFormat(input):
+        """Cheap guess of the format of input, based on its type and first characters.
+
+        Returns the name of the format whose parsers are the only ones that can
+        accept input, or None when all parsers must be tried."""
+        inputClass = input.__class__
+        if inputClass is int or inputClass is float:
+            return 'epoch'
+        if inputClass is not str:
+            return None
+        if input.isdigit() and input.isascii():
+            return 'iso8601basic'
+        if _RFC2822_SNIFF_RE.match(input) is not None:
+            return 'rfc2822'
+        if _JAVA_DEFAULT_DATE_FORMAT_SNIFF_RE.match(input) is not None:
+            return 'javaDefaultDateFormat'
+        return None
 
     @classmethod
     def parseLocal(cls, input):
@@ -73,14 +284,172 @@ class ZuluTime(object):
     def parseEpoch(cls, seconds):
         return cls(seconds)
 
+    @classmethod
+    def fromEpochMicros(cls, micros, timezone=None):
+        """The time of integer epoch microseconds, without going through float seconds."""
+        micros = operator.index(micros)
+        if not _MIN_MICROS <= micros < _MAX_MICROS:
+            raise TimeError("Out of range: %d microseconds since the epoch" % micros)
+        return cls._fromMicros(micros, timezone or UTC)
+
+    @classmethod
+    def parseZulu(cls, input):
+        """Only 'YYYY-MM-DDTHH:MM:SSZ', optionally with a fraction of seconds (to microseconds); TimeError otherwise."""
+        if _speedups is not None and input.__class__ is str and input[-1:] == 'Z':
+            scanned = _speedups.scanIso8601(input)
+            if scanned is not None:
+                return cls._fromMicros(scanned[0], UTC)
+        year, month, day, hour, minute, second, fraction = _strictMatch(_ZULU_STRICT_RE, input, 'Zulu').groups()
+        return cls._fromCivil(int(year), int(month), int(day), int(hour), int(minute), int(second), UTC, microsecond=0 if fraction is None else _microsecond(fraction))
+
+    @classmethod
+    def parseIso8601(cls, input, timezone=None):
+        """Only the ISO 8601 layouts the scanner of ZuluTime(input) reads, without trying other formats; TimeError otherwise."""
+        if input.__class__ is not str:
+            raise TimeError("Not ISO 8601: %r" % (input,))
+        if _speedups is not None:
+            result = cls._speedupsScan(input, timezone)
+            if result is not None:
+                return cls._fromMicros(*result)
+        t = cls._scanIso8601(input, timezone=timezone)
+        if t is None:
+            raise TimeError("Not ISO 8601: %r" % input)
+        return cls(_=t)
+
+    @classmethod
+    def parseRfc2822(cls, input, timezone=None):
+        """Only RFC 2822 dates, as read by email.utils; TimeError otherwise."""
+        if input.__class__ is not str:
+            raise TimeError("Not RFC 2822: %r" % (input,))
+        try:
+            return cls(_=cls._parseRfc2822(input, timezone=timezone))
+        except (ValueError, OverflowError, TypeError):
+            raise TimeError("Not RFC 2822: %r" % input)
+
+    @classmethod
+    def parseRfc1123(cls, input):
+        """Only 'Sun, 06 Nov 1994 08:49:37 GMT' as rfc1123() renders it; TimeError otherwise."""
+        weekday, day, month, year, hour, minute, second = _strictMatch(_RFC1123_STRICT_RE, input, 'RFC 1123').groups()
+        return cls._fromCivil(int(year), _MONTH_NUMBERS[month], int(day), int(hour), int(minute), int(second), UTC)
+
+    @classmethod
+    def parseHttpDate(cls, input):
+        """Any HTTP-date of RFC 7231: RFC 1123, RFC 850 ('Sunday, 06-Nov-94 08:49:37 GMT', years 70-99
+        being 19xx) or asctime ('Sun Nov  6 08:49:37 1994'), all in GMT; TimeError otherwise."""
+        if input.__class__ is str:
+            match = _RFC1123_STRICT_RE.match(input)
+            if match is not None:
+                weekday, day, month, year, hour, minute, second = match.groups()
+                return cls._fromCivil(int(year), _MONTH_NUMBERS[month], int(day), int(hour), int(minute), int(second), UTC)
+            match = _RFC850_STRICT_RE.match(input)
+            if match is not None:
+                weekday, day, month, year, hour, minute, second = match.groups()
+                year = int(year)
+                return cls._fromCivil(year + (1900 if year >= 70 else 2000), _MONTH_NUMBERS[month], int(day), int(hour), int(minute), int(second), UTC)
+            match = _ASCTIME_STRICT_RE.match(input)
+            if match is not None:
+                weekday, month, day, hour, minute, second, year = match.groups()
+                return cls._fromCivil(int(year), _MONTH_NUMBERS[month], int(day), int(hour), int(minute), int(second), UTC)
+        raise TimeError("Not an HTTP date: %r" % (input,))
+
+    @classmethod
+    def _fromCivil(cls, year, month, day, hour, minute, second, timezone, microsecond=0):
+        if not (0 < year < 10000 and 0 < month <= 12 and 0 < day <= _daysInMonth(year, month) and hour < 24 and minute < 60 and second < 60):
+            raise TimeError("Out of range: %04d-%02d-%02dT%02d:%02d:%02d" % (year, month, day, hour, minute, second))
+        wall = ((_daysFromCivil(year, month, day) * 24 + hour) * 60 + minute) * 60 + second
+        return cls._fromMicros(_utcFromWall(wall * _MICROS_PER_SECOND + microsecond, timezone), timezone)
+
+    @classmethod
+    def now(cls, resolution=1.0):
+        """The current time truncated to resolution seconds, shared until the next tick; see Clock."""
+        try:
+            clock = _clocks[resolution]
+        except KeyError:
+            clock = _clocks.setdefault(resolution, Clock(resolution=resolution))
+        return clock.now()
+
+    @classmethod
+    def _fromMicros(cls, micros, tz):
+        t = cls.__new__(cls)
+        t._micros = micros
+        t._tz = tz
+        return t
+
+    @classmethod
+    def parseMany(cls, inputs, timezone=None, output='datetime64'):
+        """Parses a column of inputs, agreeing element by element with ZuluTime(input, timezone).
+
+        Returns (values, errors) as NumPy arrays: values as datetime64[us] or, with
+        output='epoch', int64 epoch seconds; errors is True where input is not a time
+        (value NaT or 0). Without NumPy output='epoch' returns array('q') and array('B')."""
+        if output not in ('datetime64', 'epoch'):
+            raise ValueError("output must be 'datetime64' or 'epoch'")
+        numpy = _importNumpy()
+        if numpy is None and output == 'datetime64':
+            raise ImportError("parseMany(output='datetime64') requires numpy")
+        inputs = list(inputs)
+        micros = _scanZuluMany(inputs, numpy) if timezone is None or timezone is UTC else [None] * len(inputs)
+        errors = []
+        for i, value in enumerate(micros):
+            error = False
+            if value is None:
+                input = inputs[i]
+                if isinstance(input, str) and input.__class__ is not str:
+                    input = str(input)
+                try:
+                    if input is None:
+                        raise TimeError('no time')  # missing, cls(None) would be now
+                    value = cls(input, timezone=timezone)._micros
+                except TimeError:
+                    value, error = 0, True
+                micros[i] = value
+            errors.append(error)
+        if numpy is None:
+            return array('q', (value // _MICROS_PER_SECOND for value in micros)), array('B', errors)
+        values = numpy.array(micros, dtype=numpy.int64)
+        errors = numpy.array(errors, dtype=bool)
+        if output == 'epoch':
+            return values // _MICROS_PER_SECOND, errors
+        values = values.astype('datetime64[us]')
+        values[errors] = numpy.datetime64('NaT')
+        return values, errors
+
     def __lt__(self, other):
-        return self.__class__ is other.__class__ and self._ <  other._
+        if self.__class__ is not other.__class__:
+            return NotImplemented
+        return self._micros < other._micros
+
+    def __le__(self, other):
+        if self.__class__ is not other.__class__:
+            return NotImplemented
+        return self._micros <= other._micros
+
+    def __gt__(self, other):
+        if self.__class__ is not other.__class__:
+            return NotImplemented
+        return self._micros > other._micros
+
+    def __ge__(self, other):
+        if self.__class__ is not other.__class__:
+            return NotImplemented
+        return self._micros >= other._micros
 
     def __eq__(self, other):
-        return self.__class__ is other.__class__ and self._ == other._ and self.timezone == other.timezone
+        return self.__class__ is other.__class__ and self._micros == other._micros and self._tz == other._tz
+
+    def __hash__(self):
+        return hash(self._micros)  # equal times have equal micros, times in other timezones just collide
+
+    @property
+    def sortkey(self):
+        """Epoch microseconds (UTC), the int64 key ZuluTimes order by."""
+        return self._micros
+
+    def __index__(self):
+        return self._micros
 
     def equalsPointInTime(self, other):
-        return self.__class__ is other.__class__ and self._ == other._
+        return self.__class__ is other.__class__ and self._micros == other._micros
 
     def __repr__(self):
         return "%s(%s)" % (self.__class__.__name__, repr(str(self)))
@@ -90,7 +459,7 @@ class ZuluTime(object):
 
     def display(self, f):
         """Unsafe way to generate display strings that possibly loses information."""
-        return self._.strftime(f)
+        return self._format(f, self._tz)
 
     def iso8601(self, timezone=None):
         """A safe way to generate ISO date that contains proper timezone information"""
@@ -106,97 +475,161 @@ class ZuluTime(object):
         """The expires date in HTTP cookies is specified in this format."""
         return self._format(_RFC1123, timezone=UTC)
 
-    def zulu(self, timezone=None):
-        """A safe way to generate Zulu date that contains proper timezone information"""
+    def zulu(self, timezone=None, precision=0):
+        """A safe way to generate Zulu date that contains proper timezone information
+
+        precision 3 or 6 adds milliseconds or microseconds, truncated: '2012-09-06T23:27:11.403Z'."""
         timezone = timezone or UTC
-        return self._format(_ZULU, timezone=timezone)
+        result = self._format(_ZULU, timezone=timezone)
+        if precision:
+            if precision not in _ZULU_PRECISIONS:
+                raise ValueError("precision must be 0, 3 or 6")
+            result = '%s.%0*dZ' % (result[:-1], precision, self._micros % _MICROS_PER_SECOND // _ZULU_PRECISIONS[precision])
+        return result
 
     def local(self):
         return self._format(_LOCAL, Local)
 
     def iso8601basic(self, timezone=None):
         timezone = timezone or UTC
-        return self._format(''.join(element for (sep, element, l) in _ISO8601_NO_TZ if element != '%f'), timezone=timezone)
+        return self._format(_ISO8601_BASIC, timezone=timezone)
 
     def javaDefaultFormat(self, timezone=None):
         timezone = timezone or UTC
         return self._format(_JAVA_DEFAULT_DATE_FORMAT, timezone=timezone)
 
     def formatDutch(self, time):
-        t = self._.astimezone(Local)
-        date = '{day} {month} {year}'.format(
-                day=t.day,
-                month=_MONTHS['nl'][t.month],
-                year=t.year
-            )
-        if not time:
-            return date
-        return '{date}, {hour:02d}:{minute:02d} uur'.format(
-            date=date,
-            hour=t.hour,
-            minute=t.minute,
-        )
-
-    def _format(self, f, timezone=None):
-        timezone = timezone or UTC
+        return self._format(_DUTCH_DATE_TIME if time else _DUTCH_DATE, Local, locale='nl')
+
+    @staticmethod
+    def formatMany(epochs, format='zulu', timezone=None, unit='s'):
+        """Renders many epochs (seconds, or microseconds with unit='us') like the zulu(), iso8601(), rfc1123() or rfc2822() method would.
+
+        Works on integers with one cached prefix per day for zones with a fixed offset."""
         try:
-            return self._.astimezone(timezone).strftime(f)
-        except ValueError as e:
-            # datetime does not support strftime for dates with year < 1900
-            # This is a hack around this problem, will work for most formats
-            # excepts for when a weekday (%a) is involved. For a better solution
-            # see https://code.activestate.com/recipes/306860-proleptic-gregorian-dates-and-strftime-before-1900/
-            if self._.year < 1900 and not '%a' in f:
-                t = self._.replace(year=1999).astimezone(timezone)
-                r = t.strftime(f)
-                return r.replace('1999', '%04d' % self._.year)
-            raise e
+            pattern, formatDay, formatZone = _MANY_FORMATS[format]
+        except KeyError:
+            raise ValueError("format must be one of %s" % ', '.join(sorted(_MANY_FORMATS)))
+        if unit not in ('s', 'us'):
+            raise ValueError("unit must be 's' or 'us'")
+        timezone = UTC if format == 'rfc1123' else (timezone or UTC)
+        if hasattr(epochs, 'tolist'):
+            epochs = epochs.tolist()
+        if not isinstance(timezone, _TimeZone):
+            toDatetime = (lambda value: _EPOCH + timedelta(microseconds=value)) if unit == 'us' else (lambda value: ZuluTime._parseEpoch(value, timezone=UTC))
+            return [ZuluTime(_=toDatetime(value))._format(pattern, timezone) for value in epochs]
+        offset = timezone.utcoffset(None) // _ONE_SECOND
+        suffix = formatZone(timezone, offset)
+        twoDigits = _TWO_DIGITS
+        prefixes = {}
+        result = []
+        for value in epochs:
+            seconds = (_epochSeconds(value) if unit == 's' else value // _MICROS_PER_SECOND) + offset
+            days, secondOfDay = divmod(seconds, 86400)
+            prefix = prefixes.get(days)
+            if prefix is None:
+                prefix = prefixes[days] = formatDay(days)
+            hour, secondOfHour = divmod(secondOfDay, 3600)
+            minute, second = divmod(secondOfHour, 60)
+            result.append(prefix + twoDigits[hour] + ':' + twoDigits[minute] + ':' + twoDigits[second] + suffix)
+        return result
 
+    def _format(self, f, timezone=None, locale='en'):
+        timezone = timezone or UTC
+        if _speedups is not None and f in _SPEEDUPS_FORMATS:
+            offset = _offsetAt(self._micros, timezone)
+            if offset is not None:
+                utcoffset, tzname, offsetMicros = offset
+                return getattr(_speedups, _SPEEDUPS_FORMATS[f])(self._micros + offsetMicros, tzname)
+        plan = _formatPlan(f, locale)
+        if plan is None:
+            return self._.astimezone(timezone).strftime(f)
+        template, fields = plan
+        civil = _civil(self._micros, timezone)
+        return template % tuple([field(civil) for field in fields])
 
     def add(self, **kwargs):
+        """Months and years move the calendar date, clamping the day to the end of the month; other
+        keywords are those of timedelta and move the wall clock time in the timezone."""
         months = kwargs.pop('months', None)
         years = kwargs.pop('years', None)
-        newt = self._
+        year, month, day, hour, minute, second, microsecond = _civil(self._micros, self._tz)[:7]
         if months:
-            divmonth = newt.month + months
-            divyear, newmonth = divmod(divmonth -1, 12)
-            newmonth += 1
-            try:
-                newt = newt.replace(year=newt.year + divyear, month=newmonth)
-            except ValueError:
-                newt = newt.replace(year=newt.year + divyear, month=newmonth+1, day=1)
-                newt -= timedelta(days=1)
+            year, month = year + (month + months - 1) // 12, (month + months - 1) % 12 + 1
+            day = min(day, _daysInMonth(year, month))
         if years:
-            newt = newt.replace(year=newt.year + years)
-        return type(self)(_=newt + timedelta(**kwargs))
+            year += years
+            day = min(day, _daysInMonth(year, month))
+        if not 0 < year < 10000:
+            raise ValueError("year %d is out of range" % year)
+        wall = _daysFromCivil(year, month, day) * _MICROS_PER_DAY + ((hour * 60 + minute) * 60 + second) * _MICROS_PER_SECOND + microsecond
+        if kwargs:
+            wall += timedelta(**kwargs) // _ONE_MICROSECOND
+        return self._fromMicros(_utcFromWall(wall, self._tz), self._tz)
+
+    @classmethod
+    def range(cls, start, stop, step='1d', timezone=None):
+        """Yields the times from start up to (not including) stop every step, in timezone (that of start
+        by default).
+
+        step is a count and unit: 'us', 'ms', 's', 'min' and 'h' (or a timedelta) are elapsed time,
+        'd' and 'w' are wall clock days in timezone, 'M' and 'y' are calendar months and years clamped
+        to the end of the month like add(); so '1M' from January 31st gives February 29th, March 31st."""
+        count, unit = _parseStep(step)
+        timezone = timezone or start._tz
+        start = cls._fromMicros(start._micros, timezone)
+        calendar = _CALENDAR_STEPS.get(unit)
+        i = 0
+        while True:
+            if calendar is None:
+                t = cls._fromMicros(start._micros + i * count * _STEP_MICROS[unit], timezone)
+            else:
+                try:
+                    t = start.add(**{calendar: i * count * (7 if unit == 'w' else 1)})
+                except (ValueError, OverflowError):
+                    return  # past year 9999, so past stop as well
+            if t._micros >= stop._micros:
+                return
+            yield t
+            i += 1
 
     @property
-    def year(self): return self._.year
+    def year(self): return _civil(self._micros, self._tz)[0]
 
     @property
-    def month(self): return self._.month
+    def month(self): return _civil(self._micros, self._tz)[1]
 
     @property
-    def day(self): return self._.day
+    def day(self): return _civil(self._micros, self._tz)[2]
 
     @property
-    def hour(self): return self._.hour
+    def hour(self): return _civil(self._micros, self._tz)[3]
 
     @property
-    def minute(self): return self._.minute
+    def minute(self): return _civil(self._micros, self._tz)[4]
 
     @property
-    def second(self): return self._.second
+    def second(self): return _civil(self._micros, self._tz)[5]
 
     @property
-    def timezone(self): return self._.tzinfo
+    def timezone(self): return self._tz
 
     @property
-    def weekday(self): return self._.weekday
+    def weekday(self):
+        weekday = _civil(self._micros, self._tz)[7]
+        return lambda: weekday  # called like datetime.weekday()
 
     @property
     def epoch(self):
-        return timegm(self._.utctimetuple())
+        return self._micros // _MICROS_PER_SECOND
+
+    @property
+    def epochMicros(self):
+        return self._micros
+
+    @property
+    def epochNanos(self):
+        return self._micros * 1000
 
     @staticmethod
     def _parseIso8601(input, timezone=None):
@@ -210,33 +643,70 @@ class ZuluTime(object):
                 else:
                     break
             fragmentSize = len(sep) + l
-            inputParts.append(remainder[:fragmentSize])
+            if element == '%f':  # any number of digits, truncated to microseconds
+                fragmentSize = _DIGITS_RE.match(remainder, len(sep)).end()
+            inputParts.append(remainder[:min(fragmentSize, len(sep) + l)])
             remainder = remainder[fragmentSize:]
             pattern.append(sep)
             pattern.append(element)
             if len(''.join(pattern)) >= len(''.join(inputParts)):
                 break
-        for tzName, tz in _TimeZone.registered.items():
-            if tzName in remainder:
-                if timezone is None:
-                    timezone = tz
-                    remainder = remainder.replace(tzName, '').strip()
-        if timezone is None:
-            remainder, timezone = _parseTimezone(remainder)
+        remainder, timezone = _resolveTimezone(remainder, timezone)
         if remainder:
             raise ValueError("'%s' does not match" % (input + remainder))
         return datetime.strptime(''.join(inputParts), ''.join(pattern)).replace(tzinfo=timezone)
 
+    @staticmethod
+    def _scanIso8601(input, timezone=None):
+        """Single pass over the ISO 8601 and Zulu variants accepted by the cascade.
+
+        Returns None for anything it is not sure about, the cascade then decides."""
+        match = _ISO8601_SCAN_RE.match(input)
+        if match is None:
+            return None
+        year, month, day, sep, hour, minute, second, fraction, zone = match.groups()
+        microsecond = 0 if fraction is None else _microsecond(fraction)
+        if zone == 'Z':
+            # as _parseZulutimeFormat: complete time required
+            if second is None or sep != 'T':
+                return None
+            if timezone is None:
+                timezone = UTC
+        else:
+            if sep == ' ' and (second is None or zone):
+                return None  # only _parseLocalFormat accepts a space
+            if zone:
+                if zone[0] == ' ' and day is not None and hour is None:
+                    return None
+                remainder, timezone = _resolveTimezone(zone, timezone)
+                if remainder:
+                    return None
+            elif timezone is None:
+                timezone = UTC
+        try:
+            return datetime(
+                int(year),
+                1 if month is None else int(month),
+                1 if day is None else int(day),
+                0 if hour is None else int(hour),
+                0 if minute is None else int(minute),
+                0 if second is None else int(second),
+                microsecond,
+                timezone)
+        except ValueError:
+            return None
+
     @staticmethod
     def _parseZulutimeFormat(input, timezone):
         timezone = UTC if timezone is None else timezone
-        input = _ZULU_FRACTION_REMOVAL_RE.sub(r'\g<delimSeconds>\g<Z>', input)
-        return datetime.strptime(input, _ZULU).replace(tzinfo=timezone)
+        input, microsecond = _splitFraction(input)
+        return datetime.strptime(input, _ZULU).replace(microsecond=microsecond, tzinfo=timezone)
 
     @staticmethod
     def _parseLocalFormat(input, timezone):
         timezone = UTC if timezone is None else timezone
-        return datetime.strptime(input, _LOCAL).replace(tzinfo=timezone)
+        input, microsecond = _splitFraction(input)
+        return datetime.strptime(input, _LOCAL).replace(microsecond=microsecond, tzinfo=timezone)
 
     @staticmethod
     def _parseEpoch(seconds, timezone):
@@ -275,25 +745,535 @@ class ZuluTime(object):
     @staticmethod
     def _parseJavaDefaultDateFormat(input, timezone=None):
         input = input.strip()
-        for tzName, tz in _TimeZone.registered.items():
-            if tzName in input:
-                if timezone is None:
-                    timezone = tz
         if timezone is None:
-            timezone = UTC
+            parts = input.split()  # the zone is the token before the year
+            timezone = _TimeZone.registered.get(parts[-2], UTC) if len(parts) > 1 else UTC
         return datetime.strptime(input, _JAVA_DEFAULT_DATE_FORMAT).replace(tzinfo=timezone)
 
 
 
+class Clock(object):
+    """Current time at a coarse resolution, with zulu, rfc1123 and iso8601 strings rendered once per tick.
+
+    time is the source of epoch seconds, time.time by default; see Clock.monotonic."""
+
+    def __init__(self, resolution=1.0, time=time.time):
+        self.resolution = resolution
+        self._time = time
+        self._state = (None, None, None, None, None)
+
+    @classmethod
+    def monotonic(cls, resolution=1.0):
+        """A clock that follows time.monotonic, anchored at the wall clock once."""
+        offset = time.time() - time.monotonic()
+        return cls(resolution=resolution, time=lambda: time.monotonic() + offset)
+
+    def now(self):
+        return self._current()[1]
+
+    def zulu(self):
+        return self._current()[2]
+
+    def rfc1123(self):
+        return self._current()[3]
+
+    def iso8601(self):
+        return self._current()[4]
+
+    def _current(self):
+        state = self._state
+        tick = int(self._time() // self.resolution)
+        if tick != state[0]:
+            now = ZuluTime._fromMicros(int(tick * self.resolution * _MICROS_PER_SECOND), UTC)
+            state = self._state = (tick, now, now.zulu(), now.rfc1123(), now.iso8601())
+        return state
+
+_clocks = {}
+
+
+class _ParseCache(object):
+    """LRU of parse results; values are immutable (microseconds, timezone) tuples."""
+
+    def __init__(self, maxsize, threadSafe):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock() if threadSafe or _FREE_THREADED else _NoLock()
+        self.hits = self.misses = self.evictions = 0
+
+    def lookup(self, input, timezone, parse):
+        key = (input, timezone)
+        entries = self._entries
+        with self._lock:
+            try:
+                value = entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = parse(input, timezone=timezone)
+        with self._lock:
+            entries[key] = value
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def statistics(self):
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, size=len(self._entries), maxsize=self.maxsize)
+
+class _Metrics(object):
+    """Parse counters and latency histograms, labelled by the parser that accepted the input.
+
+    Inputs not reaching the cascade are accepted by the _scanIso8601 fast path (or its
+    compiled twin); fallThroughs counts parsers of the cascade that rejected an input first."""
+
+    BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3)
+
+    def __init__(self):
+        self._lock = Lock()
+        self._local = local()
+        self.parsed = {}
+        self.fallThroughs = {}
+        self.timeErrors = 0
+        self.latencies = {}  # parser: [count per bucket of BOUNDS and +Inf, sum of seconds]
+
+    def measure(self, parse, input, timezone):
+        state = self._local
+        state.parser, state.fallThroughs = '_scanIso8601', 0
+        started = time.perf_counter()
+        try:
+            result = parse(input, timezone=timezone)
+        except TimeError:
+            self._record(None, 0, time.perf_counter() - started)
+            raise
+        self._record(state.parser, state.fallThroughs, time.perf_counter() - started)
+        return result
+
+    def accepted(self, parser, fallThroughs):
+        state = self._local
+        state.parser, state.fallThroughs = parser, fallThroughs
+
+    def _record(self, parser, fallThroughs, seconds):
+        with self._lock:
+            if parser is None:
+                self.timeErrors += 1
+                parser = 'TimeError'
+            else:
+                self.parsed[parser] = self.parsed.get(parser, 0) + 1
+                self.fallThroughs[parser] = self.fallThroughs.get(parser, 0) + fallThroughs
+            latency = self.latencies.get(parser)
+            if latency is None:
+                latency = self.latencies[parser] = [0] * (len(self.BOUNDS) + 1) + [0.0]
+            latency[bisect_left(self.BOUNDS, seconds)] += 1
+            latency[-1] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            latency = {}
+            for parser, counts in self.latencies.items():
+                cumulative, buckets = 0, []
+                for bound, count in zip(self.BOUNDS + (float('inf'),), counts):
+                    cumulative += count
+                    buckets.append((bound, cumulative))
+                latency[parser] = dict(buckets=buckets, sum=counts[-1], count=cumulative)
+            return dict(parsed=dict(self.parsed), fallThroughs=dict(self.fallThroughs), timeErrors=self.timeErrors, latency=latency)
+
+    def prometheus(self):
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP zulutime_parsed_total Inputs parsed, by the parser that accepted them.',
+            '# TYPE zulutime_parsed_total counter',
+        ]
+        lines.extend('zulutime_parsed_total{parser="%s"} %d' % item for item in sorted(snapshot['parsed'].items()))
+        lines.extend([
+            '# HELP zulutime_fall_throughs_total Parsers that rejected an input before the one that accepted it.',
+            '# TYPE zulutime_fall_throughs_total counter',
+        ])
+        lines.extend('zulutime_fall_throughs_total{parser="%s"} %d' % item for item in sorted(snapshot['fallThroughs'].items()))
+        lines.extend([
+            '# HELP zulutime_time_errors_total Inputs no parser accepted.',
+            '# TYPE zulutime_time_errors_total counter',
+            'zulutime_time_errors_total %d' % snapshot['timeErrors'],
+            '# HELP zulutime_parse_seconds Time spent parsing, by the parser that accepted the input.',
+            '# TYPE zulutime_parse_seconds histogram',
+        ])
+        for parser, latency in sorted(snapshot['latency'].items()):
+            for bound, count in latency['buckets']:
+                lines.append('zulutime_parse_seconds_bucket{parser="%s",le="%s"} %d' % (parser, '+Inf' if bound == float('inf') else repr(bound), count))
+            lines.append('zulutime_parse_seconds_sum{parser="%s"} %r' % (parser, latency['sum']))
+            lines.append('zulutime_parse_seconds_count{parser="%s"} %d' % (parser, latency['count']))
+        return '\n'.join(lines) + '\n'
+
+_metrics = None
+
+
+class _NoLock(object):
+    def __enter__(self):
+        pass
+    def __exit__(self, *exc_info):
+        pass
+
+_parseCache = None
+
+
+def _importNumpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _importPyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+def _zuluTime(micros, tz, cls=None):
+    """Unpickles ZuluTime.__reduce__."""
+    return (cls or ZuluTime)._fromMicros(micros, tz)
+
+def _arrowTimezone(timezone):
+    if timezone is UTC:
+        return 'UTC'
+    if timezone.__class__ is Zone:
+        return timezone.name
+    if isinstance(timezone, _TimeZone):
+        return _fixedOffsetTimeZone(timezone.utcoffset(None) // _ONE_MINUTE).name
+    raise TimeError("Arrow has no timezone for %r" % (timezone,))
+
+def _timezoneFromArrow(name):
+    if name is None or name in ('UTC', 'Z', 'utc'):
+        return UTC
+    remainder, tz = _parseTimezone(name)
+    if not remainder:
+        return tz
+    tz = _zoneByName(name)
+    if tz is None:
+        raise TimeError("Unknown timezone '%s'" % name)
+    return tz
+
+
+_FREE_THREADED = bool(get_config_var('Py_GIL_DISABLED'))
+_MICROS_PER_SECOND = 1000000
+_MICROS_PER_DAY = 86400 * _MICROS_PER_SECOND
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_ONE_SECOND = timedelta(seconds=1)
+_ONE_MINUTE = timedelta(minutes=1)
+_ONE_DAY = timedelta(days=1)
+_WIRE = Struct('>qh')
+_WIRE_UTC, _WIRE_LOCAL, _WIRE_ZONE, _WIRE_REGISTERED, _WIRE_NEGATIVE_ZERO = 0x7FFF, 0x7FFE, 0x7FFD, 0x7FFC, 0x7FFB
+
+def _microsSinceEpoch(dt):
+    return (dt - _EPOCH) // _ONE_MICROSECOND
+
+def _civil(micros, timezone):
+    """(year, month, day, hour, minute, second, microsecond, weekday, utcoffset, tzname) of epoch micros in timezone.
+
+    Integer arithmetic for fixed offsets and Zones, other tzinfos go through datetime."""
+    offset = _offsetAt(micros, timezone)
+    if offset is None:
+        t = (_EPOCH + timedelta(microseconds=micros)).astimezone(timezone)
+        return (t.year, t.month, t.day, t.hour, t.minute, t.second, t.microsecond, t.weekday(), t.utcoffset(), t.tzname())
+    utcoffset, tzname, offsetMicros = offset
+    wall = micros + offsetMicros
+    if _speedups is not None:
+        return _speedups.civil(wall, utcoffset, tzname)
+    if not _MIN_MICROS <= wall < _MAX_MICROS:
+        raise OverflowError("date value out of range")
+    days, micros = divmod(wall, _MICROS_PER_DAY)
+    civilDays = _threadCaches.civilDays
+    try:
+        year, month, day, weekday = civilDays[days]
+    except KeyError:
+        year, month, day, weekday = _civilDay(civilDays, days)
+    seconds, microsecond = divmod(micros, _MICROS_PER_SECOND)
+    return (year, month, day, seconds // 3600, seconds // 60 % 60, seconds % 60, microsecond, weekday, utcoffset, tzname)
+
+def _offsetAt(micros, timezone):
+    """(utcoffset, tzname, utcoffset in micros) of timezone at epoch micros, None unless it is a _TimeZone or Zone."""
+    if isinstance(timezone, _TimeZone):
+        return timezone._civilOffset
+    if timezone.__class__ is Zone:
+        utcoffset, _, tzname = timezone._offsets[timezone._utcIndex(micros // _MICROS_PER_SECOND)]
+        return utcoffset, tzname, utcoffset // _ONE_MICROSECOND
+    return None
+
+def _civilDay(civilDays, days):
+    if len(civilDays) >= 4096:
+        civilDays.clear()
+    year, month, day = _civilFromDays(days)
+    result = civilDays[days] = (year, month, day, (days + 3) % 7)
+    return result
+
+
+class _ThreadCaches(local):
+    """Caches written on hot paths, one set per thread: without the GIL threads would contend on shared ones."""
+    def __init__(self):
+        self.civilDays = {}
+
+_threadCaches = _ThreadCaches()
+
+def _utcFromWall(wall, timezone):
+    """Epoch micros of wall clock micros (since 1970-01-01 in timezone), the earlier one when ambiguous."""
+    if not _MIN_MICROS <= wall < _MAX_MICROS:
+        raise OverflowError("date value out of range")
+    if isinstance(timezone, _TimeZone):
+        return wall - timezone._civilOffset[2]
+    if timezone.__class__ is Zone:
+        return wall - timezone._offsets[timezone._wallIndex(wall // _MICROS_PER_SECOND, 0)][0] // _ONE_MICROSECOND
+    days, micros = divmod(wall, _MICROS_PER_DAY)
+    return _microsSinceEpoch(datetime(*_civilFromDays(days), tzinfo=timezone) + timedelta(microseconds=micros))
+
+def _strictMatch(regex, input, format):
+    match = regex.match(input) if input.__class__ is str else None
+    if match is None:
+        raise TimeError("Not %s: %r" % (format, input))
+    return match
+
+def _parseStep(step):
+    """(count, unit) of a range step like '15min' or '1M'; a timedelta is a count of 'us'."""
+    if isinstance(step, timedelta):
+        count, unit = step // _ONE_MICROSECOND, 'us'
+    else:
+        match = _STEP_RE.match(step) if isinstance(step, str) else None
+        if match is None:
+            raise ValueError("step must be a count and one of the units %s, like '15min', got %r" % (', '.join(_STEP_UNITS), step))
+        count, unit = int(match.group('count') or '1'), match.group('unit')
+    if count <= 0:
+        raise ValueError("step must be positive, got %r" % (step,))
+    return count, unit
+
+def _stepStart(micros, count, unit, timezone):
+    """Epoch micros of the start of the step of count units in timezone that micros falls in.
+
+    Steps align to the wall clock: to multiples of the step since midnight, to midnight, to Monday,
+    to the first of months counted from January and to January 1st."""
+    year, month, day, hour, minute, second, microsecond, weekday = _civil(micros, timezone)[:8]
+    days = _daysFromCivil(year, month, day)
+    if unit in _STEP_MICROS:
+        sinceMidnight = ((hour * 60 + minute) * 60 + second) * _MICROS_PER_SECOND + microsecond
+        wall = days * _MICROS_PER_DAY + sinceMidnight - sinceMidnight % (count * _STEP_MICROS[unit])
+    elif unit == 'd':
+        wall = days * _MICROS_PER_DAY
+    elif unit == 'w':
+        wall = (days - weekday) * _MICROS_PER_DAY
+    elif unit == 'M':
+        wall = _daysFromCivil(year, month - (month - 1) % count, 1) * _MICROS_PER_DAY
+    else:
+        wall = _daysFromCivil(year, 1, 1) * _MICROS_PER_DAY
+    return _utcFromWall(wall, timezone)
+
+def _microsecond(fraction):
+    """Microseconds of the digits after the decimal point of seconds, further digits truncated."""
+    return int(fraction[:6].ljust(6, '0'))
+
+def _splitFraction(input):
+    """(input without the fraction of seconds, microseconds)."""
+    match = _SECONDS_FRACTION_RE.search(input)
+    if match is None:
+        return input, 0
+    return input[:match.start()] + match.group('delimSeconds') + match.group('Z'), _microsecond(match.group('fraction'))
+
+def _daysInMonth(year, month):
+    return _DAYS_IN_MONTH[month] + (month == 2 and _isLeap(year))
+
+def _daysFromCivil(year, month, day):
+    """Days since 1970-01-01 in the proleptic Gregorian calendar (H. Hinnant).
+
+    Branch free, so it works element wise on NumPy arrays as well."""
+    year = year - (month <= 2)
+    era = year // 400
+    yearOfEra = year - era * 400
+    dayOfYear = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    return era * 146097 + yearOfEra * 365 + yearOfEra // 4 - yearOfEra // 100 + dayOfYear - 719468
+
+_DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+_ZULU_PRECISIONS = {3: 1000, 6: 1}
+_STEP_MICROS = {'us': 1, 'ms': 1000, 's': _MICROS_PER_SECOND, 'min': 60 * _MICROS_PER_SECOND, 'h': 3600 * _MICROS_PER_SECOND}
+_CALENDAR_STEPS = {'d': 'days', 'w': 'days', 'M': 'months', 'y': 'years'}
+_STEP_UNITS = ['us', 'ms', 's', 'min', 'h', 'd', 'w', 'M', 'y']
+_STEP_RE = re.compile(r'\s*(?P<count>[0-9]+)?\s*(?P<unit>%s)\s*\Z' % '|'.join(sorted(_STEP_UNITS, key=len, reverse=True)))
+_MIN_MICROS = _daysFromCivil(1, 1, 1) * _MICROS_PER_DAY
+_MAX_MICROS = _daysFromCivil(10000, 1, 1) * _MICROS_PER_DAY
+
+def _scanZuluMany(inputs, numpy=None):
+    """Epoch microseconds for inputs in the exact _ZULU layout, None for all others."""
+    if numpy is not None:
+        column = numpy.asarray(inputs)
+        if column.dtype.kind == 'U' and column.dtype.itemsize == 4 * len('YYYY-MM-DDTHH:MM:SSZ') and column.ndim == 1:
+            return _scanZuluColumn(numpy, column)
+    result = []
+    for input in inputs:
+        match = _ZULU_SCAN_RE.match(input) if isinstance(input, str) else None
+        if match is None:
+            result.append(None)
+            continue
+        year, month, day, hour, minute, second = map(int, match.groups())
+        if not (year > 0 and 0 < month <= 12 and 0 < day <= _DAYS_IN_MONTH[month] + (month == 2 and _isLeap(year)) and hour < 24 and minute < 60 and second < 60):
+            result.append(None)
+            continue
+        result.append(((_daysFromCivil(year, month, day) * 24 + hour) * 60 + minute) * 60 * _MICROS_PER_SECOND + second * _MICROS_PER_SECOND)
+    return result
+
+def _scanZuluColumn(numpy, column):
+    codes = column.view(numpy.uint32).reshape(len(column), 20).astype(numpy.int64)
+    digits = codes - ord('0')
+    number = lambda start, end: sum(digits[:, i] * 10 ** (end - 1 - i) for i in range(start, end))
+    valid = numpy.ones(len(column), dtype=bool)
+    for position, char in [(4, '-'), (7, '-'), (10, 'T'), (13, ':'), (16, ':'), (19, 'Z')]:
+        valid &= codes[:, position] == ord(char)
+    for position in [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]:
+        valid &= (digits[:, position] >= 0) & (digits[:, position] <= 9)
+    year, month, day = number(0, 4), number(5, 7), number(8, 10)
+    hour, minute, second = number(11, 13), number(14, 16), number(17, 19)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    monthOk = (month >= 1) & (month <= 12)
+    daysInMonth = numpy.array(_DAYS_IN_MONTH)[numpy.where(monthOk, month, 0)] + (leap & (month == 2))
+    valid &= (year > 0) & monthOk & (day >= 1) & (day <= daysInMonth) & (hour < 24) & (minute < 60) & (second < 60)
+    micros = (((_daysFromCivil(year, month, day) * 24 + hour) * 60 + minute) * 60 + second) * _MICROS_PER_SECOND
+    return [int(value) if ok else None for value, ok in zip(micros.tolist(), valid.tolist())]
+
+def _civilFromDays(days):
+    """(year, month, day) for days since 1970-01-01, inverse of _daysFromCivil."""
+    days = days + 719468
+    era = days // 146097
+    dayOfEra = days - era * 146097
+    yearOfEra = (dayOfEra - dayOfEra // 1460 + dayOfEra // 36524 - dayOfEra // 146096) // 365
+    dayOfYear = dayOfEra - (365 * yearOfEra + yearOfEra // 4 - yearOfEra // 100)
+    shiftedMonth = (5 * dayOfYear + 2) // 153
+    month = (shiftedMonth + 2) % 12 + 1
+    return yearOfEra + era * 400 + (month <= 2), month, dayOfYear - (153 * shiftedMonth + 2) // 5 + 1
+
+def _epochSeconds(value):
+    """Whole seconds of an epoch, rounded the way datetime.fromtimestamp does."""
+    if value.__class__ is int:
+        return value
+    fraction, seconds = modf(value)
+    micros = round(fraction * 1e6)
+    return int(seconds) + (1 if micros >= _MICROS_PER_SECOND else -1 if micros < 0 else 0)
+
+def _formatDayIso(days):
+    year, month, day = _checkedCivilFromDays(days)
+    return '%04d-%s-%sT' % (year, _TWO_DIGITS[month], _TWO_DIGITS[day])
+
+def _formatDayRfc(days):
+    year, month, day = _checkedCivilFromDays(days)
+    return '%s, %s %s %04d ' % (_WEEKDAY_ABBREVIATIONS[(days + 3) % 7], _TWO_DIGITS[day], _MONTH_ABBREVIATIONS[month], year)
+
+def _checkedCivilFromDays(days):
+    year, month, day = _civilFromDays(days)
+    if not 0 < year < 10000:
+        raise ValueError("year %d is out of range" % year)
+    return year, month, day
+
+def _formatOffset(offset):
+    sign, offset = ('-', -offset) if offset < 0 else ('+', offset)
+    return sign + _TWO_DIGITS[offset // 3600] + _TWO_DIGITS[offset // 60 % 60]
+
+_TWO_DIGITS = ['%02d' % i for i in range(100)]
+_MONTH_NUMBERS = dict(Jan=1, Feb=2, Mar=3, Apr=4, May=5, Jun=6, Jul=7, Aug=8, Sep=9, Oct=10, Nov=11, Dec=12)
+_WEEKDAY_ABBREVIATIONS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+_MONTH_ABBREVIATIONS = [None, 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def _formatPlan(pattern, locale='en'):
+    """(template, fields) for pattern: a %-template and the functions of a _civil tuple filling it in.
+
+    Compiled once per pattern and locale; None when pattern has directives without a field here."""
+    key = (pattern, locale)
+    try:
+        return _formatPlans[key]
+    except KeyError:
+        pass
+    template, fields = [], []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        position += 1
+        if char != '%':
+            template.append(char)
+            continue
+        directive = pattern[position:position + 1]
+        if directive == '-':
+            directive = pattern[position:position + 2]
+        position += len(directive)
+        if directive == '%':
+            template.append('%%')
+            continue
+        field = _FORMAT_FIELDS.get(directive)
+        if field is None:
+            plan = None
+            break
+        template.append('%s')
+        fields.append(field(locale))
+    else:
+        plan = (''.join(template), tuple(fields))
+    return _formatPlans.setdefault(key, plan)
+
+def _formatUtcOffset(offset):
+    if offset is None:
+        return ''
+    sign, offset = ('-', -offset) if offset < _NO_TIME_DELTA else ('+', offset)
+    minutes, seconds = divmod(offset // _ONE_SECOND, 60)
+    result = sign + _TWO_DIGITS[minutes // 60] + _TWO_DIGITS[minutes % 60]
+    if seconds or offset.microseconds:
+        result += _TWO_DIGITS[seconds]
+        if offset.microseconds:
+            result += '.%06d' % offset.microseconds
+    return result
+
+_formatPlans = {}
+
+# directive: function of locale returning the function of a _civil tuple that renders the field
+_FORMAT_FIELDS = {
+    'Y': lambda locale: lambda c: '%04d' % c[0],
+    '-Y': lambda locale: lambda c: str(c[0]),
+    'm': lambda locale: lambda c: _TWO_DIGITS[c[1]],
+    'd': lambda locale: lambda c: _TWO_DIGITS[c[2]],
+    '-d': lambda locale: lambda c: str(c[2]),
+    'H': lambda locale: lambda c: _TWO_DIGITS[c[3]],
+    'M': lambda locale: lambda c: _TWO_DIGITS[c[4]],
+    'S': lambda locale: lambda c: _TWO_DIGITS[c[5]],
+    'f': lambda locale: lambda c: '%06d' % c[6],
+    'a': lambda locale: lambda c: _WEEKDAY_ABBREVIATIONS[c[7]],
+    'b': lambda locale: lambda c: _MONTH_ABBREVIATIONS[c[1]],
+    'B': lambda locale: (lambda names: lambda c: names[c[1]])(_MONTHS[locale]),
+    'Z': lambda locale: lambda c: c[9] or '',
+    'z': lambda locale: lambda c: _formatUtcOffset(c[8]),
+}
+
+def _isLeap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
 _NO_TIME_DELTA = timedelta(0)
 
 class _TimeZone(tzinfo):
-    registered = {}
-    def __init__(self, name, utcoffset, dst=None):
+    registered = {}  # a snapshot, replaced as a whole by _register and never changed in place
+    _byName = {}  # the registered _TimeZones
+    _registryLock = Lock()
+    def __init__(self, name, utcoffset, dst=None, register=True):
         self.name = name
         self._utcoffset = utcoffset
         self._dst = dst or _NO_TIME_DELTA
-        _TimeZone.registered[name] = self
+        self._civilOffset = _civilOffset(self)
+        if register and name not in _TimeZone._byName:  # a name keeps its first _TimeZone
+            _TimeZone._register(name, self)
+
+    @staticmethod
+    def _register(name, tz):
+        """Copy on write: readers take registered once and never see it change under them."""
+        with _TimeZone._registryLock:
+            registered = dict(_TimeZone.registered)
+            registered[name] = tz
+            if isinstance(tz, _TimeZone):
+                byName = dict(_TimeZone._byName)
+                byName[name] = tz
+                _TimeZone._byName = byName
+            _TimeZone.registered = registered
     def tzname(self, _):
         return self.name
     def utcoffset(self, t):
@@ -302,13 +1282,65 @@ class _TimeZone(tzinfo):
         return self._dst
 
     def __reduce__(self):
-        return (_TimeZone, (self.name, self._utcoffset))
+        return (_registeredTimeZone, (self.name, self._utcoffset // _ONE_SECOND, self._dst // _ONE_SECOND))
+
+def _legacyTimeZone(tz):
+    """The registered _TimeZone for tz from an old pickle, which kept name and utcoffset but not dst."""
+    if tz.__class__ is _TimeZone:
+        registered = _TimeZone._byName.get(tz.name)
+        if registered is not None and registered._utcoffset == tz._utcoffset and tz._dst == _NO_TIME_DELTA:
+            return registered
+    return tz
+
+def _registeredTimeZone(name, utcoffset, dst):
+    """Unpickles _TimeZone: the registered one when its offsets (seconds) match, else a new unregistered one."""
+    utcoffset, dst = timedelta(seconds=utcoffset), timedelta(seconds=dst)
+    tz = _TimeZone._byName.get(name)
+    if tz is not None and (tz._utcoffset, tz._dst) == (utcoffset, dst):
+        return tz
+    return _TimeZone(name, utcoffset, dst=dst, register=False)
+
+def _civilOffset(timezone):
+    """(utcoffset, tzname, utcoffset in micros) of a _TimeZone, as used by _civil."""
+    utcoffset = timezone._utcoffset + timezone._dst
+    return (utcoffset, timezone.name, utcoffset // _ONE_MICROSECOND)
 
 UTC = _TimeZone("UTC", _NO_TIME_DELTA)
 _CET = _TimeZone("CET", timedelta(hours=1))
 _CEST = _TimeZone("CEST", timedelta(hours=1), dst=timedelta(hours=1))
 
 
+class _FixedOffsetTimeZone(_TimeZone):
+    """Offset found in input, shared through _fixedOffsetTimeZone and not registered by name."""
+    def __init__(self, minutes, negativeZero=False):
+        sign, (hours, remainingMinutes) = '-' if minutes < 0 or negativeZero else '+', divmod(abs(minutes), 60)
+        self.name = "{sign}{hours:02d}:{minutes:02d}".format(sign=sign, hours=hours, minutes=remainingMinutes)
+        self._utcoffset = timedelta(minutes=minutes)
+        self._dst = _NO_TIME_DELTA
+        self._minutes = minutes
+        self._civilOffset = _civilOffset(self)
+
+    def __reduce__(self):
+        if self is _NEGATIVE_ZERO_OFFSET:
+            return '_NEGATIVE_ZERO_OFFSET'
+        return (_fixedOffsetTimeZone, (self._minutes,))
+
+_FIXED_OFFSET_TIMEZONES = {}
+_MAX_OFFSET_MINUTES = 24 * 60
+_NEGATIVE_ZERO_OFFSET = _FixedOffsetTimeZone(0, negativeZero=True)  # '-00:00', UTC with an unknown local offset (RFC 3339)
+
+def _fixedOffsetTimeZone(minutes):
+    try:
+        return _FIXED_OFFSET_TIMEZONES[minutes]
+    except KeyError:
+        pass
+    tz = _FixedOffsetTimeZone(minutes)
+    if -_MAX_OFFSET_MINUTES < minutes < _MAX_OFFSET_MINUTES:
+        # valid offsets only, which bounds the cache to 2879 entries
+        tz = _FIXED_OFFSET_TIMEZONES.setdefault(minutes, tz)
+    return tz
+
+
 class _OffsetOnlyTimeZone(tzinfo):
     def __init__(self, utcoffset_inseconds):
         self._utcoffset_inseconds = utcoffset_inseconds
@@ -316,25 +1348,264 @@ class _OffsetOnlyTimeZone(tzinfo):
         return timedelta(seconds=self._utcoffset_inseconds)
     def dst(self, _):
         return _NO_TIME_DELTA
+    def __reduce__(self):
+        return (_OffsetOnlyTimeZone, (self._utcoffset_inseconds,))
 
 
-_LOCAL_DELTA = timedelta(seconds=-timezone)
-_LOCAL_DST_DELTA = timedelta(seconds=-altzone) if daylight else _LOCAL_DELTA
-
 class _LocalTimezone(tzinfo):
+    def __init__(self):
+        self._rules = _LocalRules()
     def utcoffset(self, t):
-        return _LOCAL_DST_DELTA if self._isdst(t) else _LOCAL_DELTA
+        rules = self._currentRules()
+        return rules.dstDelta if rules.isdst(t) else rules.delta
     def dst(self, t):
-        return _LOCAL_DST_DELTA - _LOCAL_DELTA if self._isdst(t) else _NO_TIME_DELTA
+        rules = self._currentRules()
+        return rules.dstDelta - rules.delta if rules.isdst(t) else _NO_TIME_DELTA
     def tzname(self, t):
-        return tzname[self._isdst(t)]
+        rules = self._currentRules()
+        return rules.tzname[rules.isdst(t)]
     def _isdst(self, t):
-        tt = (t.year, t.month, t.day, t.hour, t.minute, t.second, t.weekday(), 0, 0)
-        stamp = mktime(tt)
-        return localtime(stamp).tm_isdst > 0
+        return self._currentRules().isdst(t)
+    def __reduce__(self):
+        return 'Local'  # the module global, rules follow the TZ of the process unpickling
+    def _currentRules(self):
+        rules = self._rules
+        if rules.tzname is not time.tzname:  # time.tzset() replaces it
+            rules = self._rules = _LocalRules()
+        return rules
+
+
+class _LocalRules(object):
+    """Rules of the process timezone as set by TZ, with DST transitions per year computed on demand.
+
+    isdst(t) answers what localtime(mktime(t as standard time)).tm_isdst would, by bisecting
+    transitions expressed in local standard time."""
+    def __init__(self):
+        self.tzname = time.tzname
+        self.delta = timedelta(seconds=-time.timezone)
+        self.dstDelta = timedelta(seconds=-time.altzone) if time.daylight else self.delta
+        self._years = {}
+
+    def isdst(self, t):
+        try:
+            initial, keys, states = self._years[t.year]
+        except KeyError:
+            initial, keys, states = self._years.setdefault(t.year, self._transitions(t.year))
+        if not keys:
+            return initial
+        wallSeconds = _daysFromCivil(t.year, t.month, t.day) * 86400 + t.hour * 3600 + t.minute * 60 + t.second
+        index = bisect_right(keys, wallSeconds)
+        return states[index - 1] if index else initial
+
+    @staticmethod
+    def _transitions(year):
+        start = (_daysFromCivil(year, 1, 1) - 1) * 86400
+        end = (_daysFromCivil(year + 1, 1, 1) + 1) * 86400
+        keys, states = [], []
+        previous = localtime(start)
+        initial = previous.tm_isdst > 0
+        for low in range(start, end, 86400):
+            high = low + 86400
+            current = localtime(high)
+            if (current.tm_isdst, current.tm_gmtoff) == (previous.tm_isdst, previous.tm_gmtoff):
+                previous = current
+                continue
+            while high - low > 1:
+                middle = (low + high) // 2
+                probe = localtime(middle)
+                if (probe.tm_isdst, probe.tm_gmtoff) == (previous.tm_isdst, previous.tm_gmtoff):
+                    low = middle
+                else:
+                    high = middle
+            standardOffset = previous.tm_gmtoff if current.tm_isdst > 0 else current.tm_gmtoff
+            keys.append(high + standardOffset)
+            states.append(current.tm_isdst > 0)
+            previous = current
+        return initial, keys, states
 
 Local = _LocalTimezone()
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+class Zone(tzinfo):
+    """A timezone from the IANA tz database, like Zone('Europe/Amsterdam').
+
+    The TZif file is compiled once into sorted transition lists that are bisected
+    for every conversion; zones are cached by name and registered for parsing."""
+
+    _zones = {}
+    _lock = RLock()
+
+    def __new__(cls, name):
+        try:
+            return cls._zones[name]
+        except KeyError:
+            pass
+        with cls._lock:
+            if name not in cls._zones:
+                zone = tzinfo.__new__(cls)
+                zone._load(name)
+                cls._zones[name] = zone
+                if name not in _TimeZone.registered:  # like _TimeZone, a name keeps what it was registered with first
+                    _TimeZone._register(name, zone)
+        return cls._zones[name]
+
+    def __init__(self, name):
+        pass
+
+    def _load(self, name):
+        self.name = name
+        transitions, typeIndices, types, footer = readTzif(_readZoneFile(name))
+        self._rule = PosixRule(footer) if footer else None
+        if types:
+            utcoffset, isdst, abbreviation = types[0]
+        else:
+            utcoffset, isdst, abbreviation = self._rule.stdOffset, False, self._rule.stdName
+        standard = utcoffset
+        self._offsets = [self._offset(utcoffset, isdst, abbreviation, standard)]
+        self._utcTransitions = []
+        self._wallTransitions = ([], [])
+        for transition, index in zip(transitions, typeIndices):
+            utcoffset, isdst, abbreviation = types[index]
+            if not isdst:
+                standard = utcoffset
+            self._appendTransition(transition, self._offset(utcoffset, isdst, abbreviation, standard))
+        self._untilYear = _civilFromDays(transitions[-1] // 86400)[0] - 1 if transitions else 1969
+        if self._rule is not None and self._rule.dstName is None and not transitions:
+            self._offsets[0] = self._offset(self._rule.stdOffset, False, self._rule.stdName, self._rule.stdOffset)
+        self._extend(2037)
+
+    @staticmethod
+    def _offset(utcoffset, isdst, abbreviation, standard):
+        dst = 0
+        if isdst:
+            # standard is the last offset without DST; guard against zones that changed it, like Pacific/Apia in 2011
+            dst = utcoffset - standard if 0 < utcoffset - standard <= 3 * 3600 else 3600
+        return (timedelta(seconds=utcoffset), timedelta(seconds=dst), abbreviation)
+
+    def _appendTransition(self, transition, offset):
+        # offsets first: readers index them with positions found in the transition lists
+        before = self._offsets[-1][0] // _ONE_SECOND
+        after = offset[0] // _ONE_SECOND
+        self._offsets.append(offset)
+        self._wallTransitions[0].append(transition + max(before, after))
+        self._wallTransitions[1].append(transition + min(before, after))
+        self._utcTransitions.append(transition)
+
+    def _extend(self, year):
+        """Compiles transitions from the POSIX rule up to and including year."""
+        with self._lock:
+            if self._rule is None or year <= self._untilYear:
+                return
+            rule = self._rule
+            standard = self._offset(rule.stdOffset, False, rule.stdName, rule.stdOffset)
+            daylight = self._offset(rule.dstOffset, True, rule.dstName, rule.stdOffset)
+            for y in range(self._untilYear + 1, year + 1):
+                for transition, isdst in rule.transitions(y, _daysFromCivil):
+                    if not self._utcTransitions or transition > self._utcTransitions[-1]:
+                        self._appendTransition(transition, daylight if isdst else standard)
+            self._untilYear = year
+
+    def _find(self, t):
+        seconds = _daysFromCivil(t.year, t.month, t.day) * 86400 + t.hour * 3600 + t.minute * 60 + t.second
+        return self._offsets[self._wallIndex(seconds, t.fold)]
+
+    def _wallIndex(self, seconds, fold):
+        """Index in _offsets of wall clock seconds since 1970-01-01."""
+        if seconds >= self._untilSeconds():
+            self._extend(_civilFromDays(seconds // 86400)[0] + 1)
+        return bisect_right(self._wallTransitions[fold], seconds)
+
+    def _utcIndex(self, seconds):
+        """Index in _offsets of epoch seconds."""
+        if seconds >= self._untilSeconds():
+            self._extend(_civilFromDays(seconds // 86400)[0] + 1)
+        return bisect_right(self._utcTransitions, seconds)
+
+    def _untilSeconds(self):
+        return _daysFromCivil(self._untilYear, 12, 1) * 86400 if self._rule is not None else _MAX_SECONDS
+
+    def utcoffset(self, t):
+        return None if t is None else self._find(t)[0]
+
+    def dst(self, t):
+        return None if t is None else self._find(t)[1]
+
+    def tzname(self, t):
+        return None if t is None else self._find(t)[2]
+
+    def fromutc(self, t):
+        seconds = _daysFromCivil(t.year, t.month, t.day) * 86400 + t.hour * 3600 + t.minute * 60 + t.second
+        index = self._utcIndex(seconds)
+        utcoffset = self._offsets[index][0]
+        result = t + utcoffset
+        if index:
+            repeated = self._offsets[index - 1][0] - utcoffset
+            if repeated > _NO_TIME_DELTA and seconds < self._utcTransitions[index - 1] + repeated // _ONE_SECOND:
+                return result.replace(fold=1)
+        return result
+
+    def __repr__(self):
+        return "Zone(%r)" % self.name
+
+    def __reduce__(self):
+        return (Zone, (self.name,))
+
+_MAX_SECONDS = 1 << 62
+
+def _readZoneFile(name):
+    if _ZONE_NAME_RE.match(name) is not None:
+        for directory in _zoneDirectories():
+            path = join(directory, name)
+            if isfile(path):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if data.startswith(b'TZif'):
+                    return data
+        try:
+            from importlib.resources import files
+            data = files('tzdata.zoneinfo').joinpath(name).read_bytes()
+            if data.startswith(b'TZif'):
+                return data
+        except (ImportError, OSError):  # no tzdata package or no such zone in it
+            pass
+    raise TimeError("Unknown timezone '%s'" % name)
+
+def _zoneDirectories():
+    try:
+        from zoneinfo import TZPATH
+    except ImportError:
+        TZPATH = ('/usr/share/zoneinfo', '/usr/lib/zoneinfo', '/usr/share/lib/zoneinfo', '/etc/zoneinfo')
+    return TZPATH
+
+def _zoneByName(name):
+    """Zone(name) or None; unknown names are remembered, so input like 'foo/bar' does not search TZPATH every parse."""
+    if name in _unknownZones:
+        return None
+    try:
+        return Zone(name)
+    except (TimeError, TzifError, OSError):
+        if len(_unknownZones) >= 1024:
+            _unknownZones.clear()
+        _unknownZones[name] = True
+        return None
+
+_unknownZones = {}
+
+def _resolveTimezone(remainder, timezone):
+    if timezone is None and '/' in remainder:
+        match = _ZONE_IN_INPUT_RE.search(remainder)
+        zone = None if match is None else _zoneByName(match.group('zone'))
+        if zone is not None:
+            return remainder.replace(match.group('zone'), '').strip(), zone
+    if timezone is None:
+        timezone = _TimeZone.registered.get(remainder.strip())
+        if timezone is not None:
+            remainder = ''
+    if timezone is None:
+        remainder, timezone = _parseTimezone(remainder)
+    return remainder, timezone
+
 def _parseTimezone(dateString):
     result = _TIMEDELTA_RE.search(dateString)
     if result is None:
@@ -342,13 +1613,11 @@ def _parseTimezone(dateString):
     hours = int(result.groupdict()['timedelta_hours'])
     minutes = int(result.groupdict()['timedelta_minutes'] or '0')
     sign = -1 if result.groupdict()['timedelta_sign'] == '-' else 1
-    delta = timedelta(hours=sign*hours, minutes=sign*minutes)
-    return dateString.replace(result.group(), '').strip(), \
-        _TimeZone(name="{sign}{hours:02d}:{minutes:02d}".format(
-                sign='+' if sign > 0 else '-',
-                hours=hours,
-                minutes=minutes),
-            utcoffset=delta)
+    if hours * 60 + minutes >= _MAX_OFFSET_MINUTES:
+        return dateString, UTC  # no offset, the remainder makes the parse fail
+    if sign == -1 and hours == minutes == 0:
+        return dateString.replace(result.group(), '').strip(), _NEGATIVE_ZERO_OFFSET
+    return dateString.replace(result.group(), '').strip(), _fixedOffsetTimeZone(sign * (hours * 60 + minutes))
 
 
 _ISO8601_NO_TZ = [('', '%Y', 4), ('-', '%m', 2,), ('-', '%d', 2), ('T', '%H', 2), (':', '%M', 2), (':', '%S', 2), ('.', '%f', 6)]  # "%Y-%m-%dT%H:%M:%S.%f"
@@ -358,9 +1627,21 @@ _LOCAL =  "%Y-%m-%d %H:%M:%S"
 _RFC2822 = "%a, %d %b %Y %H:%M:%S %z"
 _RFC1123 = "%a, %d %b %Y %H:%M:%S GMT"
 _JAVA_DEFAULT_DATE_FORMAT = "%a %b %d %H:%M:%S %Z %Y"
+_ISO8601_BASIC = ''.join(element for (sep, element, l) in _ISO8601_NO_TZ if element != '%f')
+_DUTCH_DATE = "%-d %B %-Y"
+_DUTCH_DATE_TIME = "%-d %B %-Y, %H:%M uur"
+
 
+# format: (strftime pattern, day prefix, zone suffix) used by ZuluTime.formatMany
+_MANY_FORMATS = {
+    'zulu': (_ZULU, _formatDayIso, lambda timezone, offset: 'Z'),
+    'iso8601': (_ISO8601, _formatDayIso, lambda timezone, offset: ' ' + timezone.tzname(None)),
+    'rfc1123': (_RFC1123, _formatDayRfc, lambda timezone, offset: ' GMT'),
+    'rfc2822': (_RFC2822, _formatDayRfc, lambda timezone, offset: ' ' + _formatOffset(offset)),
+}
 
 _MONTHS = {
+    'en': [None, 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'],
     'nl': [
         None,
         'januari',
@@ -378,6 +1659,41 @@ _MONTHS = {
     ]
 }
 
-_ZULU_FRACTION_REMOVAL_RE = re.compile(r'(?P<delimSeconds>:[0-9]+)\.[0-9]+(?P<Z>Z)$')
+# pattern: function of _speedups rendering (wall micros, tzname) like the format plan of pattern does
+_SPEEDUPS_FORMATS = {
+    _ZULU: 'formatZulu',
+    _ISO8601: 'formatIso8601',
+    _RFC1123: 'formatRfc1123',
+}
+
+# Parsers, in cascade order, that can possibly accept input of a format found by detectFormat
+_CANDIDATE_PARSERS = {
+    'epoch': ['_parseEpoch'],
+    'iso8601basic': ['_parseIso8601BasicLocal'],
+    'rfc2822': ['_parseRfc2822'],
+    'javaDefaultDateFormat': ['_parseJavaDefaultDateFormat', '_parseRfc2822'],
+}
+
+_RFC2822_SNIFF_RE = re.compile(r'(?:[A-Za-z]{3}, *)?[0-9]{1,2} [A-Za-z]{3} ')
+_JAVA_DEFAULT_DATE_FORMAT_SNIFF_RE = re.compile(r'[A-Za-z]{3} [A-Za-z]{3} [ 0-9]')
+_DIGITS_RE = re.compile(r'[0-9]*')
+_SECONDS_FRACTION_RE = re.compile(r'(?P<delimSeconds>:[0-9]+)\.(?P<fraction>[0-9]+)(?P<Z>Z?)$')
+_ISO8601_SCAN_RE = re.compile(
+    r'(?P<year>[0-9]{4})'
+    r'(?:-(?P<month>[0-9]{2})'
+    r'(?:-(?P<day>[0-9]{2})'
+    r'(?:(?P<sep>[T ])(?P<hour>[0-9]{2})'
+    r'(?::(?P<minute>[0-9]{2})'
+    r'(?::(?P<second>[0-9]{2})'
+    r'(?:\.(?P<fraction>[0-9]+))?'
+    r')?)?)?)?)?'
+    r'(?P<zone>.*)\Z', re.S)
+_ZULU_STRICT_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]+))?Z\Z')
+_RFC1123_STRICT_RE = re.compile(r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun), ([0-9]{2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) ([0-9]{4}) ([0-9]{2}):([0-9]{2}):([0-9]{2}) GMT\Z')
+_RFC850_STRICT_RE = re.compile(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday), ([0-9]{2})-(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2}) GMT\Z')
+_ASCTIME_STRICT_RE = re.compile(r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) ([ 0-9][0-9]) ([0-9]{2}):([0-9]{2}):([0-9]{2}) ([0-9]{4})\Z')
+_ZULU_SCAN_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})Z\Z')
+_ZONE_NAME_RE = re.compile(r'[A-Za-z][A-Za-z0-9_+-]*(?:/[A-Za-z0-9_+-]+)*\Z')
+_ZONE_IN_INPUT_RE = re.compile(r'(?:^|\s)(?P<zone>[A-Za-z][A-Za-z0-9_+-]*(?:/[A-Za-z0-9_+-]+)+)\s*\Z')
 _TIMEDELTA_RE = re.compile(r'(?P<timedelta_sign>\+|\-)(?P<timedelta_hours>[0-9]{2})\:?(?P<timedelta_minutes>[0-9]{2})?$')
 
@@ -23,7 +23,7 @@
 #
 ## end license ##
 
-from distutils.core import setup
+from setuptools import setup, Extension
 
 setup(
     name='seecr-zulutime',
@@ -31,11 +31,22 @@ setup(
     packages=[
         'seecr.zulutime',
     ],
+    ext_modules=[
+        # optional: _zulutime.py falls back to pure Python when it does not build
+        Extension('seecr.zulutime._speedups', ['seecr/zulutime/_speedups.c'], optional=True),
+    ],
+    extras_require={
+        'numpy': ['numpy'],
+        'arrow': ['pyarrow'],
+    },
     url='http://seecr.nl',
     author='Seecr',
     author_email='info@seecr.nl',
     description="Zulutime helps formatting and parsing timestamps.",
     long_description="Zulutime helps formatting and parsing timestamps.",
     platforms=['linux'],
+    classifiers=[
+        'Programming Language :: Python :: Free Threading :: 2 - Beta',
+    ],
 )
 
@@ -36,6 +36,11 @@ path.insert(0, '..')
 import unittest
 
 from zulutimetest import ZuluTimeTest
+from scantest import ScanTest
+from speedupstest import PurePythonZuluTimeTest, SpeedupsTest
+from bulktest import BulkTest
+from ndjsontest import NdjsonTest
+from bucketstest import BucketsTest
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase, skipIf
+from random import Random
+
+from seecr.zulutime import ZuluTime, Zone, bucketize
+from seecr.zulutime import _buckets
+from seecr.zulutime._zulutime import _importNumpy
+
+numpy = _importNumpy()
+
+
+class BucketsTest(TestCase):
+    def tearDown(self):
+        _buckets._importNumpy = _importNumpy
+
+    def testDays(self):
+        amsterdam = Zone('Europe/Amsterdam')
+        epochs = [ZuluTime(wall, timezone=amsterdam).epoch for wall in ['2024-03-31T23:30:00', '2024-03-30T00:00:00', '2024-03-31T00:00:00', '2024-04-02T12:00:00']]
+        for withNumpy in [True, False]:
+            if not withNumpy:
+                _buckets._importNumpy = lambda: None
+            boundaries, indices = bucketize(epochs, '1d', amsterdam)
+            self.assertEqual([ZuluTime(wall, timezone=amsterdam).epoch for wall in ['2024-03-30T00:00:00', '2024-03-31T00:00:00', '2024-04-01T00:00:00', '2024-04-02T00:00:00']], list(boundaries))
+            self.assertEqual([86400, 82800, 86400], [int(b - a) for a, b in zip(boundaries, boundaries[1:])])
+            self.assertEqual([1, 0, 1, 3], list(indices))
+
+    def testMonthsInTimezoneAndQuarters(self):
+        epochs = [ZuluTime(s).epoch for s in ['2023-12-31T23:30:00Z', '2024-02-29T12:00:00Z', '2024-05-01T00:00:00Z']]
+        boundaries, indices = bucketize(epochs, '1M', ZuluTime('2024-01-01T00:00:00+01:00').timezone)
+        self.assertEqual(['2023-12-31T23:00:00Z', '2024-01-31T23:00:00Z', '2024-02-29T23:00:00Z', '2024-03-31T23:00:00Z', '2024-04-30T23:00:00Z'], [ZuluTime(int(b)).zulu() for b in boundaries])
+        self.assertEqual([0, 1, 4], list(indices))
+        boundaries, indices = bucketize(epochs, '3M')
+        self.assertEqual(['2023-10-01T00:00:00Z', '2024-01-01T00:00:00Z', '2024-04-01T00:00:00Z'], [ZuluTime(int(b)).zulu() for b in boundaries])
+        self.assertEqual([0, 1, 2], list(indices))
+
+    def testAgreesWithLinearAssignment(self):
+        random = Random(42)
+        epochs = [random.randint(1700000000, 1720000000) + random.random() for _ in range(500)]
+        for unit in ['15min', '1h', '1d', '1w', '1M', '1y']:
+            for withNumpy in [True, False]:
+                _buckets._importNumpy = _importNumpy if withNumpy else (lambda: None)
+                boundaries, indices = bucketize(epochs, unit, Zone('Europe/Amsterdam'))
+                self.assertEqual(sorted(boundaries), list(boundaries))
+                for epoch, index in zip(epochs, indices):
+                    self.assertTrue(boundaries[index] <= epoch, (unit, epoch))
+                    self.assertTrue(index + 1 == len(boundaries) or epoch < boundaries[index + 1], (unit, epoch))
+
+    def testEmptyAndErrors(self):
+        self.assertEqual(0, len(bucketize([], '1d')[0]))
+        self.assertEqual(0, len(bucketize(iter([]), '1d')[1]))
+        self.assertRaises(ValueError, lambda: bucketize([0], '10ms'))
+        self.assertRaises(ValueError, lambda: bucketize([0], '1 fortnight'))
+
+    @skipIf(numpy is None, "numpy not installed")
+    def testNumpyArrays(self):
+        boundaries, indices = bucketize(numpy.array([0, 3599, 3600, 7200], dtype=numpy.int64), '1h')
+        self.assertEqual('int64', str(boundaries.dtype))
+        self.assertEqual([0, 3600, 7200], boundaries.tolist())
+        self.assertEqual([0, 0, 1, 2], indices.tolist())
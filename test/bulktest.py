@@ -0,0 +1,65 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+from itertools import count, islice
+
+from seecr.zulutime import ZuluTime, Zone, convertBulk
+
+
+INPUTS = ['2012-09-06T23:27:11Z', 'Mon, 20 Nov 1995 21:12:08 +0200', 'this is no valid time', 1510240477, '20120906232711', None]
+
+
+class BulkTest(TestCase):
+    def testConvertInProcess(self):
+        self.assertEqual([
+                ('2012-09-06T23:27:11Z', None),
+                ('1995-11-20T19:12:08Z', None),
+                (None, 'Format unknown'),
+                ('2017-11-09T15:14:37Z', None),
+                ('2012-09-06T23:27:11Z', None),
+            ], list(convertBulk(INPUTS[:-1], workers=1, chunksize=2)))
+
+    def testNoneIsAnErrorNotNow(self):
+        expected = [(None, 'no time'), ('2012-09-06T23:27:11Z', None), (None, 'no time'), (None, 'no time')]
+        self.assertEqual(expected, list(convertBulk([None, '2012-09-06T23:27:11Z', b'2012-09-06T23:27:11Z', [1346974031]], workers=1)))
+        self.assertEqual(expected, list(convertBulk([None, '2012-09-06T23:27:11Z', b'2012-09-06T23:27:11Z', [1346974031]], workers=2, chunksize=1)))
+        self.assertEqual((None, 'no time'), list(convertBulk(INPUTS, workers=1))[-1])
+
+    def testConvertWithPoolKeepsOrder(self):
+        inputs = [ZuluTime(1346974031 + i * 3607).iso8601() for i in range(1000)] + ['no time'] + INPUTS[:4]
+        expected = [(ZuluTime(value).epoch, None) for value in inputs[:1000]] + [(None, 'Format unknown'), (1346974031, None), (816894728, None), (None, 'Format unknown'), (1510240477, None)]
+        self.assertEqual(expected, list(convertBulk(inputs, output='epoch', workers=2, chunksize=37)))
+
+    def testStreamsEndlessInput(self):
+        results = convertBulk((1346974031 + i for i in count()), output='rfc1123', workers=2, chunksize=10)
+        self.assertEqual(('Thu, 06 Sep 2012 23:27:36 GMT', None), list(islice(results, 26))[-1])
+        results.close()
+
+    def testTimezone(self):
+        self.assertEqual([('2012-09-06T21:27:11Z', None)], list(convertBulk(['2012-09-06T23:27:11'], workers=1, timezone=Zone('Europe/Amsterdam'))))
+        self.assertEqual([('2012-09-06T21:27:11Z', None)], list(convertBulk(['2012-09-06T23:27:11'], workers=2, timezone=Zone('Europe/Amsterdam'))))
+
+    def testOutputMustBeKnown(self):
+        self.assertRaises(ValueError, lambda: next(convertBulk([], output='java')))
@@ -0,0 +1,88 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+
+from seecr.zulutime import ZuluTime, normalizeNdjson
+
+
+RECORDS = b"""{"id": 1, "header": {"datestamp": "2012-09-06T23:27:11+02:00"}, "dates": ["Mon, 20 Nov 1995 21:12:08 +0200", "unknown"]}
+{"id": 2, "header": {"datestamp": 1346974031}, "dates": []}
+
+{"id": 3, "header": [{"datestamp": "2012-09-06"}, {"datestamp": null}, {"other": true}]}
+{"id": 4, "header": {"datestamp": "no time"}, "dates": "2012-09-06T23:27:11Z"}"""
+
+
+class NdjsonTest(TestCase):
+    def testNormalize(self):
+        records = self.normalize(self.chunked(RECORDS, 7), ['header.datestamp', 'dates'])
+        self.assertEqual([
+                {"id": 1, "header": {"datestamp": "2012-09-06T21:27:11Z"}, "dates": ["1995-11-20T19:12:08Z", "unknown"]},
+                {"id": 2, "header": {"datestamp": "2012-09-06T23:27:11Z"}, "dates": []},
+                {"id": 3, "header": [{"datestamp": "2012-09-06T00:00:00Z"}, {"datestamp": None}, {"other": True}]},
+                {"id": 4, "header": {"datestamp": "no time"}, "dates": "2012-09-06T23:27:11Z"},
+            ], records)
+
+    def testEpochInBatches(self):
+        lines = b''.join(b'{"t": "%s"}\n' % ZuluTime(1346974031 + i).zulu().encode() for i in range(25))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            records = self.normalize(self.chunked(lines, 100), ['t'], output='epoch', batchSize=10, executor=executor)
+        self.assertEqual([{'t': 1346974031 + i} for i in range(25)], records)
+
+    def testTricklingStreamIsNotHeldBack(self):
+        async def trickle():
+            yield b'{"t": 1346974031}\n{"t": '
+            await asyncio.Event().wait()  # nothing more, for now
+        async def first():
+            records = normalizeNdjson(trickle(), ['t'], batchSize=1000)
+            try:
+                return await asyncio.wait_for(records.__anext__(), timeout=5)
+            finally:
+                await records.aclose()
+        self.assertEqual({'t': '2012-09-06T23:27:11Z'}, asyncio.run(first()))
+
+    def testNoneInListsIsLeftAsIs(self):
+        self.assertEqual([{'t': [None, '2012-09-06T23:27:11Z', {'a': 1}]}], self.normalize(self.chunked(b'{"t": [null, 1346974031, {"a": 1}]}', 5), ['t']))
+
+    def testLongLinesInManyChunks(self):
+        line = b'{"t": 1346974031, "padding": "' + b'x' * 100000 + b'"}\n'
+        records = self.normalize(self.chunked(line * 3, 7), ['t'])
+        self.assertEqual(['2012-09-06T23:27:11Z'] * 3, [record['t'] for record in records])
+
+    def testLinesAreBounded(self):
+        self.assertRaises(ValueError, lambda: self.normalize(self.chunked(b'{"t": "' + b'x' * 100, 10), ['t'], maxLineLength=64))
+        self.assertRaises(ValueError, lambda: self.normalize(self.chunked(RECORDS, 10), ['t'], output='java'))
+
+    def normalize(self, stream, fields, **kwargs):
+        async def collect():
+            return [record async for record in normalizeNdjson(stream, fields, **kwargs)]
+        return asyncio.run(collect())
+
+    @staticmethod
+    async def chunked(data, size):
+        for i in range(0, len(data), size):
+            await asyncio.sleep(0)
+            yield data[i:i + size]
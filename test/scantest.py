@@ -0,0 +1,84 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from io import BytesIO
+from os.path import join
+
+from seecr.zulutime import ZuluTime, scan, seekTo
+
+
+LOG = b"""harvest started
+2012-09-06T23:27:11Z GET /oai?verb=ListRecords
+2012-09-06T23:27:12.5Z GET /oai?verb=GetRecord
+no time on this line
+[2012-09-07 01:27:13+02:00] added record
+Fri, 07 Sep 2012 01:30:00 +0200 mail received
+2012-09-07T10:00:00Z done"""
+
+
+class ScanTest(TestCase):
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.path = join(self.tempdir.name, 'harvest.log')
+        with open(self.path, 'wb') as f:
+            f.write(LOG)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def testScan(self):
+        offsets = [LOG.index(line) for line in [b'2012-09-06T23:27:11Z', b'2012-09-06T23:27:12.5Z', b'[2012-09-07', b'Fri, 07', b'2012-09-07T10']]
+        epochs = [ZuluTime(s).epoch for s in ['2012-09-06T23:27:11Z', '2012-09-06T23:27:12Z', '2012-09-06T23:27:13Z', '2012-09-06T23:30:00Z', '2012-09-07T10:00:00Z']]
+        self.assertEqual(list(zip(offsets, epochs)), list(scan(self.path)))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(list(zip(offsets, epochs)), list(scan(f)))
+        self.assertEqual(list(zip(offsets, epochs)), list(scan(BytesIO(LOG))))
+
+    def testScanOneFormat(self):
+        self.assertEqual([(LOG.index(b'Fri, 07'), ZuluTime('2012-09-06T23:30:00Z').epoch)], list(scan(self.path, format='rfc2822')))
+        self.assertEqual(4, len(list(scan(self.path, format='iso8601'))))
+        self.assertRaises(ValueError, lambda: list(scan(self.path, format='java')))
+
+    def testScanEmptyFile(self):
+        with open(self.path, 'wb') as f:
+            pass
+        self.assertEqual([], list(scan(self.path)))
+        self.assertEqual(0, seekTo(self.path, ZuluTime()))
+
+    def testSeekTo(self):
+        self.assertEqual(LOG.index(b'2012-09-06T23:27:11Z'), seekTo(self.path, ZuluTime('2012-09-06T00:00:00Z')))
+        self.assertEqual(LOG.index(b'2012-09-06T23:27:12.5Z'), seekTo(self.path, ZuluTime('2012-09-06T23:27:12Z')))
+        self.assertEqual(LOG.index(b'2012-09-07T10'), seekTo(self.path, ZuluTime('2012-09-07T09:00:00Z')))
+        self.assertEqual(len(LOG), seekTo(self.path, ZuluTime('2013-01-01T00:00:00Z')))
+
+    def testSeekToInLargeFile(self):
+        with open(self.path, 'wb') as f:
+            for i in range(20000):
+                f.write(('%s line %d with some padding\n' % (ZuluTime(1346974031 + i * 7).zulu(), i)).encode())
+        offset = seekTo(self.path, ZuluTime(1346974031 + 12345 * 7 - 3))
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            self.assertTrue(f.readline().endswith(b' line 12345 with some padding\n'))
@@ -0,0 +1,105 @@
+## begin license ##
+#
+# Zulutime helps formatting and parsing timestamps.
+#
+# Copyright (C) 2012-2018, 2020-2021 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Zulutime"
+#
+# "Zulutime" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Zulutime" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Zulutime"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import sys
+from unittest import TestCase, skipIf
+from random import Random
+
+from seecr.zulutime import ZuluTime, TimeError, UTC, Local, Zone
+from seecr.zulutime import _zulutime
+from seecr.zulutime._zulutime import _CEST, _fixedOffsetTimeZone
+
+from zulutimetest import ZuluTimeTest
+
+
+@skipIf(_zulutime._speedups is None, "_speedups not built, ZuluTimeTest runs pure Python already")
+class PurePythonZuluTimeTest(ZuluTimeTest):
+    """All of ZuluTimeTest without the compiled accelerator."""
+
+    def setUp(self):
+        ZuluTimeTest.setUp(self)
+        self._speedups = _zulutime._speedups
+        _zulutime._speedups = None
+
+    def tearDown(self):
+        _zulutime._speedups = self._speedups
+        ZuluTimeTest.tearDown(self)
+
+
+@skipIf(_zulutime._speedups is None, "_speedups not built")
+class SpeedupsTest(TestCase):
+    def setUp(self):
+        self.speedups = _zulutime._speedups
+
+    def tearDown(self):
+        _zulutime._speedups = self.speedups
+
+    @skipIf(not _zulutime._FREE_THREADED, "not a free-threaded build")
+    def testImportKeepsTheGilDisabled(self):
+        self.assertFalse(sys._is_gil_enabled())
+
+    def testParseAgreesWithPurePython(self):
+        random = Random(20211)
+        pieces = [
+            ['2012', '0000', '1582', '9999', '2012-', '201'],
+            ['-09', '-02', '-13', '-00', '-9', ''],
+            ['-06', '-29', '-30', '-31', '-00', ''],
+            ['T23:27', ' 23:27', 'T24:00', 'T23', 'T23:60', ''],
+            [':11', ':59', ':60', ':1', ''],
+            ['', '.403578', '.4', '.1234567', '.'],
+            ['Z', '', '+02:00', '-0130', '+02', '+24:00', '+02:75', '+02:', ' CET', 'CEST', ' Europe/Amsterdam', 'Z ', ' '],
+        ]
+        for i in range(4000):
+            input = ''.join(choices[0] if random.random() < 0.7 else random.choice(choices) for choices in pieces)
+            for timezone in [None, UTC, Local, Zone('America/New_York')]:
+                self.assertEqual(self.parse(input, timezone, None), self.parse(input, timezone, self.speedups), (input, timezone))
+
+    def testFormatAgreesWithPurePython(self):
+        random = Random(20212)
+        zones = [UTC, _CEST, _fixedOffsetTimeZone(-330), Zone('Europe/Amsterdam'), Zone('Australia/Lord_Howe'), Local]
+        for i in range(5000):
+            t = ZuluTime._fromMicros(random.randrange(-62135596800000000, 253402300800000000), UTC)
+            timezone = random.choice(zones)
+            self.assertEqual(self.format(t, timezone, None), self.format(t, timezone, self.speedups), (t._micros, timezone))
+
+    def testOutOfRange(self):
+        t = ZuluTime('9999-12-31T23:30:00Z')
+        self.assertRaises(OverflowError, lambda: t.zulu(timezone=_CEST))
+        self.assertRaises(OverflowError, lambda: self.speedups.formatRfc1123(-62135596800000001, None))
+        self.assertEqual('0001-01-01T00:00:00Z', self.speedups.formatZulu(-62135596800000000, None))
+
+    def parse(self, input, timezone, speedups):
+        _zulutime._speedups = speedups
+        try:
+            t = ZuluTime(input, timezone=timezone)
+        except (TimeError, ValueError, OverflowError) as e:
+            return repr(e)
+        return t._micros, t.timezone
+
+    def format(self, t, timezone, speedups):
+        _zulutime._speedups = speedups
+        try:
+            return t.zulu(timezone), t.iso8601(timezone), t.rfc1123(), t.rfc2822(timezone), (t.year, t.month, t.day, t.hour, t.minute, t.second, t.weekday())
+        except OverflowError as e:
+            return repr(e)
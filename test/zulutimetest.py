@@ -22,19 +22,28 @@
 #
 ## end license ##
 
-from unittest import TestCase
-from os import popen
+from unittest import TestCase, skipIf
+from os import popen, environ
+from time import tzset, mktime, localtime
+from datetime import datetime, timedelta
 from random import shuffle
+from pickle import dumps, loads
+from array import array
+from bisect import bisect
+import operator
+from threading import Thread, Barrier
 
-from seecr.zulutime import ZuluTime, TimeError, UTC, Local
-from seecr.zulutime._zulutime import _ZULU_FRACTION_REMOVAL_RE, _CEST, _TIMEDELTA_RE
+from seecr.zulutime import ZuluTime, TimeError, UTC, Local, Zone, Clock
+from seecr.zulutime._tzif import PosixRule
+from seecr.zulutime._zulutime import _CEST, _TIMEDELTA_RE, _TimeZone, _FIXED_OFFSET_TIMEZONES, _scanZuluMany, _importNumpy, _daysFromCivil, _formatPlan, _importPyarrow, _SECONDS_FRACTION_RE, _threadCaches
+
+numpy = _importNumpy()
+pyarrow = _importPyarrow()
 
 
 # TODO:
 #   - Use python-aniso8601 for _parseZulutimeFormat (maybe formats too);
 #     since it supports:
-#       * Fractions of seconds (example: 2012-09-06T23:27:11.123456789Z )
-#                                                           ^^^^^^^^^^
 #       * Can return the granularity/precision of the parsed datetime / date / time format.
 #         Handy for when you want to output a datetime format in the same precision as some input.
 
@@ -123,6 +132,29 @@ class ZuluTimeTest(TestCase):
         self.assertEqual(t_ref.second, t.second)
         self.assertEqual(UTC, t.timezone)
 
+    def testNow(self):
+        t = ZuluTime.now()
+        self.assertEqual(0, t._micros % 1000000)
+        self.assertTrue(abs(ZuluTime().epoch - t.epoch) <= 1)
+        self.assertTrue(ZuluTime.now(resolution=60).epoch % 60 == 0)
+
+    def testClock(self):
+        seconds = [1426596781.2]
+        clock = Clock(time=lambda: seconds[0])
+        now = clock.now()
+        self.assertEqual(ZuluTime('2015-03-17T12:53:01Z'), now)
+        self.assertEqual('2015-03-17T12:53:01Z', clock.zulu())
+        self.assertEqual('Tue, 17 Mar 2015 12:53:01 GMT', clock.rfc1123())
+        self.assertEqual('2015-03-17T12:53:01 UTC', clock.iso8601())
+        seconds[0] = 1426596781.9
+        self.assertTrue(now is clock.now())
+        seconds[0] = 1426596782.0
+        self.assertEqual('2015-03-17T12:53:02Z', clock.zulu())
+        clock = Clock(resolution=0.25, time=lambda: seconds[0])
+        seconds[0] = 1426596782.3
+        self.assertEqual(1426596782250000, clock.now()._micros)
+        self.assertTrue(abs(ZuluTime().epoch - Clock.monotonic().now().epoch) <= 1)
+
     def testParseZulu(self):
         t = ZuluTime("2012-09-06T23:27:11Z")
         self.assertEqual(2012, t.year)
@@ -150,23 +182,22 @@ class ZuluTimeTest(TestCase):
         self.assertEqual(ZuluTime("2012-09-06T23:00:00Z"), ZuluTime("2012090623"))
         self.assertRaises(TimeError, lambda: ZuluTime("20120906Z"))
 
-    def testIso8601ZuluTimeFractions(self):
-        # Hack for not using a better iso8601 / Zulu time parser.
-        self.assertEqual({'Z': 'Z', 'delimSeconds': ':11'}, _ZULU_FRACTION_REMOVAL_RE.search('2012-09-06T23:27:11.0123Z').groupdict())
-        self.assertEqual({'Z': 'Z', 'delimSeconds': ':59'}, _ZULU_FRACTION_REMOVAL_RE.search(':59.00000000000000000001Z').groupdict())
-        self.assertEqual({'Z': 'Z', 'delimSeconds': ':00'}, _ZULU_FRACTION_REMOVAL_RE.search(':00.0Z').groupdict())
+    def testSecondsFraction(self):
+        self.assertEqual({'Z': 'Z', 'delimSeconds': ':11', 'fraction': '0123'}, _SECONDS_FRACTION_RE.search('2012-09-06T23:27:11.0123Z').groupdict())
+        self.assertEqual({'Z': 'Z', 'delimSeconds': ':59', 'fraction': '00000000000000000001'}, _SECONDS_FRACTION_RE.search(':59.00000000000000000001Z').groupdict())
+        self.assertEqual({'Z': 'Z', 'delimSeconds': ':00', 'fraction': '0'}, _SECONDS_FRACTION_RE.search(':00.0Z').groupdict())
+        self.assertEqual({'Z': '', 'delimSeconds': ':11', 'fraction': '5'}, _SECONDS_FRACTION_RE.search('2012-09-06 23:27:11.5').groupdict())
 
-        self.assertEqual(None, _ZULU_FRACTION_REMOVAL_RE.search('2012-09-06T23:27:11Z'))
-        self.assertEqual(None, _ZULU_FRACTION_REMOVAL_RE.search(':11Z'))
-        self.assertEqual(None, _ZULU_FRACTION_REMOVAL_RE.search(':11.Z'))
-        self.assertEqual(None, _ZULU_FRACTION_REMOVAL_RE.search(':.0Z'))
+        self.assertEqual(None, _SECONDS_FRACTION_RE.search('2012-09-06T23:27:11Z'))
+        self.assertEqual(None, _SECONDS_FRACTION_RE.search(':11Z'))
+        self.assertEqual(None, _SECONDS_FRACTION_RE.search(':11.Z'))
+        self.assertEqual(None, _SECONDS_FRACTION_RE.search(':.0Z'))
 
         # Wrong, but we don't want to make a parser, strptime will fail for us.
-        self.assertEqual({'Z': 'Z', 'delimSeconds': ':99'}, _ZULU_FRACTION_REMOVAL_RE.search(':99.0Z').groupdict())
-        self.assertEqual({'Z': 'Z', 'delimSeconds': ':0'}, _ZULU_FRACTION_REMOVAL_RE.search(':0.0Z').groupdict())
+        self.assertEqual({'Z': 'Z', 'delimSeconds': ':99', 'fraction': '0'}, _SECONDS_FRACTION_RE.search(':99.0Z').groupdict())
+        self.assertEqual({'Z': 'Z', 'delimSeconds': ':0', 'fraction': '0'}, _SECONDS_FRACTION_RE.search(':0.0Z').groupdict())
 
-    def testParseZuluWithFractionalSecondsParsesButFractionIsIgnored(self):
-        # Hack for not using a better iso8601 / Zulu time parser.
+    def testParseZuluWithFractionalSeconds(self):
         t = ZuluTime("2012-09-06T23:27:11.123456789Z")
         self.assertEqual(2012, t.year)
         self.assertEqual(   9, t.month)
@@ -174,9 +205,54 @@ class ZuluTimeTest(TestCase):
         self.assertEqual(  23, t.hour)
         self.assertEqual(  27, t.minute)
         self.assertEqual(  11, t.second)
+        self.assertEqual(1346974031123456, t.epochMicros)
         self.assertEqual("UTC", t.timezone.tzname(None))
         self.assertEqual(    0, t.timezone.utcoffset(t).days)
         self.assertEqual(    0, t.timezone.dst(t).seconds)
+        self.assertEqual(1346974031400000, ZuluTime("2012-09-06T23:27:11.4Z").epochMicros)
+        self.assertEqual(1346974031400000, ZuluTime._parseZulutimeFormat("2012-09-06T23:27:11.4Z", None).timestamp() * 1000000)
+
+    def testMicrosecondsInEveryFormat(self):
+        for input, timezone in [
+                ('2012-09-06T23:27:11.403578Z', None),
+                ('2012-09-06T23:27:11.403578', None),
+                ('2012-09-06 23:27:11.403578', None),
+                ('2012-09-06T23:27:11.4035781Z', None),
+                ('2012-09-06T23:27:11.403578+00:00', None),
+                ('2012-09-07T01:27:11.403578+02:00', None),
+                ('2012-09-07T01:27:11.403578 CEST', None),
+                ('2012-09-07T01:27:11.403578', Zone('Europe/Amsterdam')),
+            ]:
+            self.assertEqual(1346974031403578, ZuluTime(input, timezone=timezone).epochMicros, input)
+        self.assertEqual(1346970431400000, ZuluTime('2012-09-06T23:27:11.4+01:00').epochMicros)
+        self.assertEqual(1346974031403578, ZuluTime.parseZulu('2012-09-06T23:27:11.403578Z').epochMicros)
+        self.assertEqual(1346974031403578, ZuluTime.parseIso8601('2012-09-06T23:27:11.403578').epochMicros)
+        self.assertEqual(1346974031403578, ZuluTime(1346974031.403578).epochMicros)
+
+    def testEpochMicrosAndNanos(self):
+        t = ZuluTime('2012-09-06T23:27:11.403578Z')
+        self.assertEqual(1346974031, t.epoch)
+        self.assertEqual(1346974031403578, t.epochMicros)
+        self.assertEqual(1346974031403578000, t.epochNanos)
+        self.assertEqual(-1, ZuluTime('1969-12-31T23:59:59.5Z').epoch)
+        self.assertEqual(-500000, ZuluTime('1969-12-31T23:59:59.5Z').epochMicros)
+        self.assertEqual(t, ZuluTime.fromEpochMicros(1346974031403578))
+        self.assertTrue(ZuluTime.fromEpochMicros(0, timezone=Local).timezone is Local)
+        self.assertRaises(TimeError, lambda: ZuluTime.fromEpochMicros(10 ** 18))
+        self.assertRaises(TypeError, lambda: ZuluTime.fromEpochMicros(1.5))
+        self.assertEqual(1346974031000000, ZuluTime(1346974031).epochMicros)
+        self.assertTrue(ZuluTime(1346974031, timezone=Local).timezone is Local)
+        self.assertRaises(TimeError, lambda: ZuluTime(10 ** 12))
+
+    def testZuluPrecision(self):
+        t = ZuluTime('2012-09-06T23:27:11.403578Z')
+        self.assertEqual('2012-09-06T23:27:11Z', t.zulu())
+        self.assertEqual('2012-09-06T23:27:11.403Z', t.zulu(precision=3))
+        self.assertEqual('2012-09-06T23:27:11.403578Z', t.zulu(precision=6))
+        self.assertEqual('2012-09-06T23:27:11.000Z', ZuluTime('2012-09-06T23:27:11Z').zulu(precision=3))
+        self.assertEqual('1969-12-31T23:59:59.500000Z', ZuluTime('1969-12-31T23:59:59.5Z').zulu(precision=6))
+        self.assertEqual(t, ZuluTime(t.zulu(precision=6)))
+        self.assertRaises(ValueError, lambda: t.zulu(precision=9))
 
     def testParseIso8601CET(self):
         zt = ZuluTime("2011-01-13T16:59:59 CET")
@@ -196,6 +272,52 @@ class ZuluTimeTest(TestCase):
         self.assertEqual('2020-12-21T00:42:24Z', ZuluTime("2020-12-21T01:42:24+01:00").zulu())
         self.assertEqual('2020-12-21T00:42:24Z', ZuluTime("2020-12-21T01:42:24.403578+01:00").zulu())
 
+    def testScanIso8601AgreesWithCascade(self):
+        someTime = ZuluTime()
+        for date in ['2012', '2012-09', '2012-9', '2012-09-06', '2012-02-30', '2012-09-06T23', '2012-09-06 23', '2012-09-06T23:27:11', '2012-09-06 23:27:11']:
+            for fraction in ['', '.1', '.123456', '.1234567']:
+                for zone in ['', 'Z', ' Z', '+02:00', '+0200', ' +02', '-0133', ' CET', 'CEST', ' XYZ', ' ']:
+                    for timezone in [None, UTC, Local]:
+                        input = date + fraction + zone
+                        scanned = ZuluTime._scanIso8601(input, timezone=timezone)
+                        if scanned is None:
+                            continue
+                        parsed = someTime._parseCascade(input, timezone=timezone)
+                        self.assertEqual(parsed, scanned, input)
+                        self.assertEqual(parsed.replace(tzinfo=None), scanned.replace(tzinfo=None), input)
+                        self.assertEqual(parsed.tzname(), scanned.tzname(), input)
+
+    def testScanIso8601RecognisesCommonFormats(self):
+        for input in ['2012', '2012-09-06', '2012-09-06T23:27:11Z', '2012-09-06T23:27:11.123Z', '2012-09-06T23:27:11', '2012-09-06 23:27:11', '2012-09-06T23:27:11.403578+01:00', '2012-09-06T23:27:11 CET']:
+            self.assertNotEqual(None, ZuluTime._scanIso8601(input), input)
+        for input in ['Mon, 20 Nov 1995 21:12:08 +0200', '20120906', '2012-09-06 23:27:11.4035+01:00', ' 2012-09-06']:
+            self.assertEqual(None, ZuluTime._scanIso8601(input), input)
+
+    def testDetectFormat(self):
+        self.assertEqual('epoch', ZuluTime.detectFormat(1510240477))
+        self.assertEqual('epoch', ZuluTime.detectFormat(1510240477.14))
+        self.assertEqual('iso8601basic', ZuluTime.detectFormat('20120906232711'))
+        self.assertEqual('rfc2822', ZuluTime.detectFormat('Mon, 20 Nov 1995 21:12:08 -0500'))
+        self.assertEqual('rfc2822', ZuluTime.detectFormat('20 Nov 1995 21:12:08 -0500'))
+        self.assertEqual('javaDefaultDateFormat', ZuluTime.detectFormat('Thu Jan 13 00:59:59 CET 2011'))
+        self.assertEqual(None, ZuluTime.detectFormat('2012-09-06T23:27:11Z'))
+        self.assertEqual(None, ZuluTime.detectFormat('this is no valid time'))
+        self.assertEqual(None, ZuluTime.detectFormat(b'20120906'))
+
+    def testDetectedFormatAgreesWithCascade(self):
+        someTime = ZuluTime()
+        for input in [0, 1510240477.14, float('nan'), '20120906', '2012090623', '1510240477', 'Mon, 20 Nov 1995 21:12:08 -0500', 'Mon, 20 Nov 1995 21:12:08', 'Mon, 40 Nov 1995 21:12:08', 'Thu Jan 13 00:59:59 CET 2011', 'Thu Jan 13 00:59:59 2011']:
+            for timezone in [None, Local]:
+                try:
+                    parsed = someTime._parseCascade(input, timezone=timezone)
+                except TimeError as e:
+                    parsed = str(e)
+                try:
+                    dispatched = someTime._parse(input, timezone=timezone)
+                except TimeError as e:
+                    dispatched = str(e)
+                self.assertEqual(parsed, dispatched, input)
+
     def testParseJavaDefaultDateFormat(self):
         zt = ZuluTime('Thu Jan 13 00:59:59 CET 2011')
         self.assertEqual('2011-01-12T23:59:59 UTC', zt.iso8601())
@@ -225,6 +347,135 @@ class ZuluTimeTest(TestCase):
         self.assertEqual('2012-09-07T01:27:11Z', ZuluTime("2012-09-06T23:27:11 -02").zulu())
         self.assertEqual('2012-09-07T01:00:11Z', ZuluTime("2012-09-06T23:27:11-0133").zulu())
 
+    def testOffsetsOfADayOrMoreAreNoTime(self):
+        for input in ['2012-09-06T23:27:11+24:00', '2012-09-06T23:27:11-24:00', '2012-09-06T23:27:11+99', '2012-09-06T23:27:11 +2400', '2012-09-06 23:27:11 -9959']:
+            self.assertRaises(TimeError, lambda: ZuluTime(input))
+        self.assertEqual('2012-09-06T23:28:11Z', ZuluTime('2012-09-06T23:27:11-00:01').zulu())
+        self.assertEqual('2012-09-05T23:28:11Z', ZuluTime('2012-09-06T23:27:11+23:59').zulu())
+
+    def testParsedOffsetsAreSharedAndNotRegistered(self):
+        registered = dict(_TimeZone.registered)
+        t0 = ZuluTime("2012-09-06T23:27:11+02:00")
+        t1 = ZuluTime("2012-09-06T23:27:11 +0200")
+        self.assertTrue(t0.timezone is t1.timezone)
+        self.assertEqual(t0, t1)
+        self.assertEqual('+02:00', t0.timezone.tzname(None))
+        self.assertEqual('-01:33', ZuluTime("2012-09-06T23:27:11-0133").timezone.tzname(None))
+        self.assertTrue(t0.timezone is loads(dumps(t0.timezone)))
+        self.assertEqual(registered, _TimeZone.registered)
+
+    def testNegativeZeroOffsetIsKept(self):
+        for input in ['2012-09-06T23:27:11-00:00', '2012-09-06T23:27:11 -0000', '2012-09-06T23:27:11-00']:
+            t = ZuluTime(input)
+            self.assertEqual('2012-09-06T23:27:11 -00:00', str(t), input)
+            self.assertEqual('2012-09-06T23:27:11Z', t.zulu())
+            self.assertEqual(t.timezone, ZuluTime.parseIso8601(input).timezone)
+        t = ZuluTime('2012-09-06T23:27:11-00:00')
+        self.assertTrue(t.timezone is not ZuluTime('2012-09-06T23:27:11+00:00').timezone)
+        self.assertEqual('2012-09-06T23:27:11 +00:00', str(ZuluTime('2012-09-06T23:27:11+00:00')))
+        self.assertTrue(t.equalsPointInTime(ZuluTime('2012-09-06T23:27:11+00:00')))
+        self.assertTrue(loads(dumps(t)).timezone is t.timezone)
+        self.assertTrue(ZuluTime.fromBytes(t.toBytes()).timezone is t.timezone)
+
+    def testManyParsedOffsetsKeepRegistryAndCacheBounded(self):
+        registered = dict(_TimeZone.registered)
+        for i in range(20000):
+            hours, minutes = divmod(i % (24 * 60), 60)
+            sign = '-+'[i % 2]
+            t = ZuluTime("2012-09-06T23:27:11%s%02d:%02d" % (sign, hours, minutes))
+            self.assertEqual(t.timezone.utcoffset(None).total_seconds(), (1 if sign == '+' else -1) * (hours * 3600 + minutes * 60))
+        self.assertEqual(registered, _TimeZone.registered)
+        self.assertTrue(len(_FIXED_OFFSET_TIMEZONES) < 2 * 24 * 60)
+
+    def testUnknownZoneNamesAreLookedUpOnce(self):
+        from seecr.zulutime import _zulutime
+        readZoneFile = _zulutime._readZoneFile
+        reads = []
+        def countingRead(name):
+            reads.append(name)
+            return readZoneFile(name)
+        _zulutime._readZoneFile = countingRead
+        try:
+            for _ in range(3):
+                self.assertRaises(TimeError, lambda: ZuluTime('2012-09-06T23:27:11 Nowhere/Special'))
+        finally:
+            _zulutime._readZoneFile = readZoneFile
+        self.assertTrue(reads.count('Nowhere/Special') <= 1, reads)
+
+    def testRegisteredNamesAreLookedUpAsWholeTokens(self):
+        Zone('EST')
+        self.assertEqual('2012-09-06T21:27:11Z', ZuluTime("2012-09-06T23:27:11 CEST").zulu())
+        self.assertTrue(ZuluTime("2012-09-06T23:27:11 EST").timezone is Zone('EST'))
+        self.assertEqual('2011-01-12T23:59:59Z', ZuluTime('2011-01-13T00:59:59 CET').zulu())
+        self.assertRaises(TimeError, lambda: ZuluTime("2012-09-06T23:27:11 XCEST"))
+        registered = _TimeZone.registered
+        name = next(name for name in ['America/Winnipeg', 'America/Denver', 'Asia/Seoul', 'Europe/Oslo'] if name not in registered)
+        Zone(name)
+        self.assertFalse(name in registered)
+        self.assertTrue(_TimeZone.registered[name] is Zone(name))
+
+    def testZonesDoNotTakeOverRegisteredNames(self):
+        utc = ZuluTime('2011-07-13T15:59:59 UTC')
+        Zone('CET')
+        Zone('UTC')
+        self.assertEqual('2011-07-13T15:59:59Z', ZuluTime('2011-07-13T16:59:59 CET').zulu())
+        self.assertTrue(ZuluTime('2011-07-13T16:59:59 CET').timezone is _TimeZone.registered['CET'])
+        self.assertTrue(ZuluTime('2011-07-13T15:59:59 UTC').timezone is UTC)
+        self.assertEqual(utc, ZuluTime('2011-07-13T15:59:59 UTC'))
+
+    def testParsingFromManyThreads(self):
+        zoneNames = ['America/New_York', 'Asia/Tokyo', 'Australia/Adelaide', 'Europe/London', 'Africa/Cairo', 'Asia/Kolkata', 'America/Sao_Paulo', 'Pacific/Auckland']
+        failures = []
+        start = Barrier(9)
+        def parse(worker):
+            start.wait()
+            try:
+                for i in range(300):
+                    hours, minutes = divmod((worker * 300 + i) * 7 % (24 * 60), 60)
+                    sign = '-+'[i % 2]
+                    t = ZuluTime("2012-09-06T23:27:11 %s%02d%02d" % (sign, hours, minutes))
+                    if t.timezone.utcoffset(None) != (1 if sign == '+' else -1) * timedelta(hours=hours, minutes=minutes):
+                        failures.append(t)
+                    if ZuluTime("2012-09-06T23:27:11 CEST").zulu() != '2012-09-06T21:27:11Z':
+                        failures.append('CEST')
+                    if ZuluTime('2011-01-13T00:59:59 CET').zulu() != '2011-01-12T23:59:59Z':
+                        failures.append('CET')
+            except Exception as e:
+                failures.append(e)
+        def register():
+            start.wait()
+            for name in zoneNames:
+                ZuluTime("2012-09-06T23:27:11 %s" % name)
+        threads = [Thread(target=parse, args=(worker,)) for worker in range(8)] + [Thread(target=register)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], failures)
+        self.assertTrue(all(name in _TimeZone.registered for name in zoneNames))
+
+    def testCachesFromManyThreads(self):
+        micros = [ZuluTime('2012-09-06T23:27:11.5Z')._micros + i * 86400000123 for i in range(-3000, 3000, 7)]
+        inputs = ['2012-09-06T23:27:11%s%02d:00' % ('-+'[i % 2], i % 14) for i in range(100)]
+        expected = [ZuluTime._fromMicros(m, UTC).display('%Y-%m-%d %H:%M:%S.%f %a') for m in micros], [ZuluTime(input).zulu() for input in inputs] * 5
+        results, civilDays = [], []
+        start = Barrier(6)
+        def work():
+            start.wait()
+            civilDays.append(_threadCaches.civilDays)
+            results.append(([ZuluTime._fromMicros(m, UTC).display('%Y-%m-%d %H:%M:%S.%f %a') for m in micros], [ZuluTime(input).zulu() for input in inputs * 5]))
+        ZuluTime.configureParseCache(maxsize=50)
+        try:
+            threads = [Thread(target=work) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            ZuluTime.configureParseCache(maxsize=0)
+        self.assertEqual([expected] * 6, results)
+        self.assertEqual(6, len(set(id(cache) for cache in civilDays)))
+
     def testFormatZulu(self):
         t = ZuluTime("Mon, 20 Nov 1995 21:12:08 +0200")
         self.assertEqual("1995-11-20T19:12:08Z", t.zulu())
@@ -274,6 +525,70 @@ class ZuluTimeTest(TestCase):
         t = ZuluTime('2013-11-22T15:00:00Z')
         self.assertEqual('20131122150000', t.iso8601basic())
 
+    def testLocalDstAgreesWithMktime(self):
+        for year in [1658, 1940, 1977, 2014, 2037]:
+            t = datetime(year, 1, 1)
+            while t.year == year:
+                tt = (t.year, t.month, t.day, t.hour, t.minute, t.second, t.weekday(), 0, 0)
+                self.assertEqual(localtime(mktime(tt)).tm_isdst > 0, Local._isdst(t), t)
+                t += timedelta(minutes=30)
+
+    def testLocalFollowsTzset(self):
+        summer = ZuluTime('2014-07-01T12:00:00Z')
+        self.assertEqual('2014-07-01 14:00:00', summer.local())
+        originalTZ = environ.get('TZ')
+        try:
+            environ['TZ'] = 'America/New_York'
+            tzset()
+            self.assertEqual('2014-07-01 08:00:00', summer.local())
+            self.assertEqual('2014-07-01T08:00:00 EDT', summer.iso8601(timezone=Local))
+            self.assertEqual('2014-12-01T07:00:00 EST', ZuluTime('2014-12-01T12:00:00Z').iso8601(timezone=Local))
+        finally:
+            if originalTZ is None:
+                del environ['TZ']
+            else:
+                environ['TZ'] = originalTZ
+            tzset()
+        self.assertEqual('2014-07-01 14:00:00', summer.local())
+
+    def testZone(self):
+        amsterdam = Zone('Europe/Amsterdam')
+        self.assertTrue(amsterdam is Zone('Europe/Amsterdam'))
+        self.assertTrue(amsterdam is loads(dumps(amsterdam)))
+        self.assertEqual('2011-01-13T16:59:59 CET', ZuluTime('2011-01-13T15:59:59Z').iso8601(timezone=amsterdam))
+        self.assertEqual('2011-08-13T16:59:59 CEST', ZuluTime('2011-08-13T14:59:59Z').iso8601(timezone=amsterdam))
+        self.assertEqual('2087-08-13T16:59:59 CEST', ZuluTime('2087-08-13T14:59:59Z').iso8601(timezone=amsterdam))
+        self.assertEqual('1939-08-13T16:39:31 +0120', ZuluTime('1939-08-13T15:19:31Z').iso8601(timezone=amsterdam))
+        self.assertEqual('2011-07-13T12:59:59 EDT', ZuluTime('2011-07-13T16:59:59Z').iso8601(timezone=Zone('America/New_York')))
+        self.assertRaises(TimeError, lambda: Zone('Europe/Atlantis'))
+        self.assertRaises(TimeError, lambda: Zone('../../etc/passwd'))
+
+    def testZoneAgreesWithZoneinfo(self):
+        from zoneinfo import ZoneInfo
+        for name in ['Europe/Amsterdam', 'America/New_York', 'Australia/Lord_Howe', 'Pacific/Apia', 'UTC']:
+            zone, reference = Zone(name), ZoneInfo(name)
+            t = datetime(1900, 1, 1, tzinfo=UTC)
+            while t.year < 2100:
+                converted, expected = t.astimezone(zone), t.astimezone(reference)
+                self.assertEqual((expected.replace(tzinfo=None), expected.fold, expected.tzname()), (converted.replace(tzinfo=None), converted.fold, converted.tzname()), (name, t))
+                self.assertEqual(expected.utcoffset(), converted.utcoffset())
+                t += timedelta(hours=173, minutes=17)
+
+    def testParseWithZoneName(self):
+        t = ZuluTime('2011-07-13T16:59:59 Europe/Amsterdam')
+        self.assertEqual('2011-07-13T14:59:59Z', t.zulu())
+        self.assertTrue(Zone('Europe/Amsterdam') is t.timezone)
+        self.assertEqual('2011-01-13T15:59:59Z', ZuluTime('2011-01-13T16:59:59 Europe/Amsterdam').zulu())
+        self.assertRaises(TimeError, lambda: ZuluTime('2011-01-13T16:59:59 Europe/Atlantis'))
+
+    def testPosixRule(self):
+        rule = PosixRule('CET-1CEST,M3.5.0,M10.5.0/3')
+        self.assertEqual(('CET', 3600, 'CEST', 7200), (rule.stdName, rule.stdOffset, rule.dstName, rule.dstOffset))
+        self.assertEqual([(ZuluTime('2021-03-28T01:00:00Z').epoch, True), (ZuluTime('2021-10-31T01:00:00Z').epoch, False)], rule.transitions(2021, _daysFromCivil))
+        rule = PosixRule('<+1030>-10:30<+11>-11,M10.1.0,M4.1.0')
+        self.assertEqual([(ZuluTime('2021-04-03T15:00:00Z').epoch, False), (ZuluTime('2021-10-02T15:30:00Z').epoch, True)], rule.transitions(2021, _daysFromCivil))
+        self.assertEqual([], PosixRule('<-03>3').transitions(2021, _daysFromCivil))
+
     def testLocalToZulu(self):
         t = ZuluTime('2014-09-03 12:30:00', timezone=Local)
         self.assertEqual('2014-09-03T10:30:00Z', t.zulu())
@@ -313,6 +628,108 @@ class ZuluTimeTest(TestCase):
         self.assertEqual('1969-01-01T00:00:01Z', fromSeconds(-31535999))
         self.assertEqual('2015-03-17T12:53:01Z', fromSeconds(1426596781))
 
+    def testScanZuluManyWithoutNumpy(self):
+        inputs = ['2012-09-06T23:27:11Z', '1658-01-01T00:00:00Z', '2012-02-29T00:00:00Z', '2013-02-29T00:00:00Z', '2012-09-06T24:27:11Z', '2012-09-06', 1]
+        self.assertEqual([1346974031000000, -9845712000000000, 1330473600000000, None, None, None, None], _scanZuluMany(inputs))
+
+    PARSE_MANY_INPUTS = ['2012-09-06T23:27:11Z', '1658-01-01T00:00:00Z', '2012-02-30T00:00:00Z', '1969-12-31T23:59:59Z', '2012-09-06', 'Mon, 20 Nov 1995 21:12:08 +0200', 'this is no valid time', 1510240477.14]
+
+    @skipIf(numpy is None, "numpy not installed")
+    def testParseManyAgreesWithZuluTime(self):
+        for timezone in [None, Local]:
+            values, errors = ZuluTime.parseMany(self.PARSE_MANY_INPUTS, timezone=timezone)
+            epochs, epochErrors = ZuluTime.parseMany(self.PARSE_MANY_INPUTS, timezone=timezone, output='epoch')
+            self.assertEqual('datetime64[us]', str(values.dtype))
+            self.assertEqual([False, False, True, False, False, False, True, False], errors.tolist())
+            self.assertEqual(errors.tolist(), epochErrors.tolist())
+            for input, value, epoch, error in zip(self.PARSE_MANY_INPUTS, values.tolist(), epochs.tolist(), errors):
+                if error:
+                    self.assertRaises(TimeError, lambda: ZuluTime(input, timezone=timezone))
+                    self.assertEqual(None, value)
+                    continue
+                t = ZuluTime(input, timezone=timezone)
+                self.assertEqual(t.epoch, epoch)
+                self.assertEqual(t._.astimezone(UTC).replace(tzinfo=None), value)
+
+    @skipIf(numpy is None, "numpy not installed")
+    def testParseManyZuluColumn(self):
+        column = numpy.array(['2012-09-06T23:27:11Z', '2012-02-29T00:00:00Z', '2013-02-29T00:00:00Z', 'xxxx-09-06T23:27:11Z'])
+        epochs, errors = ZuluTime.parseMany(column, output='epoch')
+        self.assertEqual([1346974031, 1330473600, 0, 0], epochs.tolist())
+        self.assertEqual([False, False, True, True], errors.tolist())
+
+    def testParseManyNoneIsAnError(self):
+        epochs, errors = ZuluTime.parseMany([None, '2012-09-06T23:27:11Z', None], output='epoch')
+        self.assertEqual([0, 1346974031, 0], list(epochs))
+        self.assertEqual([True, False, True], [bool(error) for error in errors])
+        if numpy is not None:
+            values, errors = ZuluTime.parseMany(numpy.array([None, '2012-09-06T23:27:11Z'], dtype=object))
+            self.assertEqual([None, datetime(2012, 9, 6, 23, 27, 11)], values.tolist())
+            self.assertEqual([True, False], errors.tolist())
+
+    def testFormatMany(self):
+        epochs = [0, 1, -31535999, 1426596781, 1510240477.14, -9845712000, 0.9999996]
+        self.assertEqual(['1970-01-01T00:00:00Z', '1970-01-01T00:00:01Z', '1969-01-01T00:00:01Z', '2015-03-17T12:53:01Z', '2017-11-09T15:14:37Z', '1658-01-01T00:00:00Z', '1970-01-01T00:00:01Z'], ZuluTime.formatMany(epochs))
+        self.assertEqual(['Thu, 01 Jan 1970 00:00:00 GMT', 'Tue, 17 Mar 2015 12:53:01 GMT'], ZuluTime.formatMany([0, 1426596781000000], format='rfc1123', unit='us'))
+        self.assertEqual(['2015-03-17T13:53:01 CET'], ZuluTime.formatMany([1426596781], format='iso8601', timezone=ZuluTime("2011-01-13T16:59:59 CET").timezone))
+        for timezone in [None, UTC, Local, _CEST, ZuluTime("2012-09-06T23:27:11-0133").timezone]:
+            for format in ['zulu', 'iso8601', 'rfc2822']:
+                self.assertEqual([getattr(ZuluTime(epoch), format)(timezone=timezone) for epoch in epochs], ZuluTime.formatMany(epochs, format=format, timezone=timezone))
+        self.assertRaises(ValueError, lambda: ZuluTime.formatMany([0], format='dutch'))
+
+    def testCompactRepresentation(self):
+        t = ZuluTime("2012-09-06T23:27:11.403578+02:00")
+        self.assertFalse(hasattr(t, '__dict__'))
+        self.assertEqual(1346966831403578, t._micros)
+        self.assertEqual('+02:00', t._tz.tzname(None))
+        self.assertEqual((2012, 9, 6, 23, 27, 11), (t.year, t.month, t.day, t.hour, t.minute, t.second))
+        self.assertEqual(403578, t._.microsecond)
+        self.assertEqual(1346966831, t.epoch)
+
+    def testPickle(self):
+        t = ZuluTime("2012-09-06T23:27:11+02:00")
+        u = loads(dumps(t))
+        self.assertEqual(t, u)
+        self.assertEqual(t.hour, u.hour)
+        self.assertTrue(t.timezone is u.timezone)
+
+    def testUnpickleStateFromBeforeSlots(self):
+        t = ZuluTime.__new__(ZuluTime)
+        t.__setstate__({'_': ZuluTime("2014-09-03 12:30:00", timezone=Local)._})
+        self.assertEqual('2014-09-03T10:30:00Z', t.zulu())
+        self.assertEqual(12, t.hour)
+        self.assertTrue(Local is t.timezone)
+
+    def testUnpickleBaselinePickles(self):
+        # pickled by the release before __slots__, whose _TimeZone pickles dropped dst
+        cest = loads(b'\x80\x02cseecr.zulutime._zulutime\nZuluTime\nq\x00)\x81q\x01}q\x02X\x01\x00\x00\x00_q\x03cdatetime\ndatetime\nq\x04c_codecs\nencode\nq\x05X\x0b\x00\x00\x00\x07\xc3\x9c\t\x06\x17\x1b\x0b\x00\x00\x00q\x06X\x06\x00\x00\x00latin1q\x07\x86q\x08Rq\tcseecr.zulutime._zulutime\n_TimeZone\nq\nX\x04\x00\x00\x00CESTq\x0bcdatetime\ntimedelta\nq\x0cK\x00M\x10\x0eK\x00\x87q\rRq\x0e\x86q\x0fRq\x10\x86q\x11Rq\x12sb.')
+        utc = loads(b'\x80\x02cseecr.zulutime._zulutime\nZuluTime\nq\x00)\x81q\x01}q\x02X\x01\x00\x00\x00_q\x03cdatetime\ndatetime\nq\x04c_codecs\nencode\nq\x05X\x0b\x00\x00\x00\x07\xc3\x9c\t\x06\x17\x1b\x0b\x00\x00\x00q\x06X\x06\x00\x00\x00latin1q\x07\x86q\x08Rq\tcseecr.zulutime._zulutime\n_TimeZone\nq\nX\x03\x00\x00\x00UTCq\x0bcdatetime\ntimedelta\nq\x0cK\x00K\x00K\x00\x87q\rRq\x0e\x86q\x0fRq\x10\x86q\x11Rq\x12sb.')
+        self.assertEqual('2012-09-06T21:27:11Z', cest.zulu())
+        self.assertTrue(cest.timezone is _CEST)
+        self.assertEqual('2012-09-06T23:27:11Z', utc.zulu())
+        self.assertTrue(utc.timezone is UTC)
+        self.assertTrue(_TimeZone.registered['CEST'] is _CEST)
+        self.assertEqual('2012-09-06T21:27:11Z', ZuluTime('2012-09-06T23:27:11 CEST').zulu())
+
+    def testParseCache(self):
+        self.assertEqual(None, ZuluTime.parseCacheStatistics())
+        try:
+            ZuluTime.configureParseCache(maxsize=2)
+            t = ZuluTime('2012-09-06T23:27:11+02:00')
+            self.assertEqual(t, ZuluTime('2012-09-06T23:27:11+02:00'))
+            self.assertFalse(t is ZuluTime('2012-09-06T23:27:11+02:00'))
+            self.assertEqual('2012-09-06T23:27:11Z', ZuluTime('2012-09-06T23:27:11').zulu())
+            self.assertEqual('2012-09-06T21:27:11Z', ZuluTime('2012-09-06T23:27:11', timezone=_CEST).zulu())
+            self.assertEqual(dict(hits=2, misses=3, evictions=1, size=2, maxsize=2), ZuluTime.parseCacheStatistics())
+            self.assertRaises(TimeError, lambda: ZuluTime('this is no valid time'))
+            self.assertEqual(2, ZuluTime.parseCacheStatistics()['size'])
+            ZuluTime.configureParseCache(maxsize=10, threadSafe=True)
+            ZuluTime('2012-09-06T23:27:11Z')
+            self.assertEqual(dict(hits=0, misses=1, evictions=0, size=1, maxsize=10), ZuluTime.parseCacheStatistics())
+        finally:
+            ZuluTime.configureParseCache(maxsize=0)
+        self.assertEqual(None, ZuluTime.parseCacheStatistics())
+
     def testSorting(self):
         t4 = ZuluTime('2013-11-22T15:00:00Z')
         t2 = ZuluTime('2013-11-21T15:00:00Z')
@@ -324,6 +741,30 @@ class ZuluTimeTest(TestCase):
         self.assertNotEqual([t1,t2,t3,t4,t5], zuluTimes)
         self.assertEqual([t1,t2,t3,t4,t5], sorted(zuluTimes))
 
+    def testTotalOrderingAndHash(self):
+        t1 = ZuluTime('2013-11-20T15:00:00Z')
+        t2 = ZuluTime('2013-11-20T16:00:00+01:00')
+        t3 = t1.add(microseconds=1)
+        self.assertTrue(t1 < t3 and t1 <= t3 and t3 > t1 and t3 >= t1)
+        self.assertTrue(t1 <= t2 and t1 >= t2 and not t1 < t2 and not t1 > t2)
+        self.assertNotEqual(t1, t2)
+        self.assertTrue(t1.equalsPointInTime(t2))
+        self.assertEqual(hash(t1), hash(ZuluTime('2013-11-20T15:00:00Z')))
+        self.assertEqual({t1: 'a', t3: 'b'}, {ZuluTime('2013-11-20T15:00:00Z'): 'a', t3: 'b'})
+        self.assertEqual(2, len({t1, t2}))
+        for other in [None, 1384959600, t1._, '2013-11-20T15:00:00Z']:
+            self.assertRaises(TypeError, lambda: t1 < other)
+            self.assertRaises(TypeError, lambda: t1 >= other)
+            self.assertNotEqual(t1, other)
+
+    def testSortkeyAndIndex(self):
+        times = [ZuluTime('2013-11-22T15:00:00Z'), ZuluTime('1658-01-01T00:00:00Z'), ZuluTime('2013-11-20T15:00:00Z').add(microseconds=500000)]
+        self.assertEqual(1384959600500000, times[2].sortkey)
+        self.assertEqual(-9845712000000000, times[1].sortkey)
+        self.assertEqual(sorted(t.sortkey for t in times), list(array('q', sorted(times))))
+        self.assertEqual(1, bisect([t.sortkey for t in sorted(times)], times[1].sortkey))
+        self.assertEqual(times[2].sortkey, operator.index(times[2]))
+
     def testAncient(self):
         x = ZuluTime('1658')
         self.assertEqual('1658-01-01T00:00:00Z', x.zulu())
@@ -335,5 +776,188 @@ class ZuluTimeTest(TestCase):
         self.assertEqual("Tue, 01 Jan 1658 00:00:00 GMT", x.rfc1123())
         self.assertEqual("Tue Jan 01 00:00:00 UTC 1658", x.javaDefaultFormat())
 
+    def testVeryAncient(self):
+        x = ZuluTime('0658-03-04T05:06:07Z')
+        self.assertEqual('0658-03-04T05:06:07Z', x.zulu())
+        self.assertEqual('Thu, 04 Mar 0658 05:06:07 GMT', x.rfc1123())
+        self.assertEqual('Thu Mar 04 05:06:07 UTC 0658', x.javaDefaultFormat())
+        self.assertEqual('4 maart 658', x.formatDutch(time=False))
+        self.assertEqual(['0658-03-04T05:06:07Z'], ZuluTime.formatMany([x.epoch]))
+
+    def testFormatPlan(self):
+        self.assertEqual(('%s-%s-%sT%s:%s:%sZ', 6), (_formatPlan('%Y-%m-%dT%H:%M:%SZ')[0], len(_formatPlan('%Y-%m-%dT%H:%M:%SZ')[1])))
+        self.assertTrue(_formatPlan('%Y') is _formatPlan('%Y'))
+        self.assertEqual(None, _formatPlan('%j'))
+        t = ZuluTime('2012-09-06T23:27:11.403578+02:00')
+        self.assertEqual('250 %100% 403578 September +0200', t.display('%j %%100%% %f %B %z'))
+        self.assertEqual('100% 403578 September +0200', t.display('100%% %f %B %z'))
+
+    def testAddClampsMonthEndsAndLeapDays(self):
+        t = ZuluTime('2020-02-29T10:00:00Z')
+        self.assertEqual('2021-02-28T10:00:00Z', t.add(years=1).zulu())
+        self.assertEqual('2024-02-29T10:00:00Z', t.add(years=4).zulu())
+        self.assertEqual('1573-03-31T10:00:00Z', ZuluTime('1573-01-31T10:00:00Z').add(months=2).zulu())
+        self.assertEqual('1572-12-31T23:00:00Z', ZuluTime('1573-01-01T00:00:00Z').add(hours=-1).zulu())
+        self.assertRaises(ValueError, lambda: t.add(years=8000))
+        self.assertRaises(OverflowError, lambda: ZuluTime('0001-01-01T00:00:00Z').add(seconds=-1))
+
+    def testAddKeepsWallClockInTimezone(self):
+        amsterdam = Zone('Europe/Amsterdam')
+        t = ZuluTime('2021-03-27T12:00:00', timezone=amsterdam)
+        self.assertEqual('2021-03-28T12:00:00 CEST', str(t.add(days=1)))
+        self.assertEqual(23 * 3600, t.add(days=1).epoch - t.epoch)
+        self.assertTrue(t.add(days=1).timezone is amsterdam)
+
+    def testFieldsWithoutDatetime(self):
+        t = ZuluTime('1573-03-04T23:30:07Z')
+        self.assertEqual((1573, 3, 4, 23, 30, 7, 6), (t.year, t.month, t.day, t.hour, t.minute, t.second, t.weekday()))
+        t = ZuluTime('1573-03-04T23:30:07+01:00')
+        self.assertEqual((1573, 3, 4, 23, 30, 7, 6), (t.year, t.month, t.day, t.hour, t.minute, t.second, t.weekday()))
+        self.assertEqual('1573-03-05T00:30:07 CEST', t.iso8601(timezone=_CEST))
+        self.assertEqual('1573-03-04T22:49:39 LMT', t.iso8601(timezone=Zone('Europe/Amsterdam')))
+        for micros in range(-14000000000000000, 8000000000000000, 123456789012345):
+            t = ZuluTime._fromMicros(micros, Zone('America/New_York'))
+            self.assertEqual(t._.strftime('%Y-%m-%d %H:%M:%S.%f %a %Z %z'), t.display('%Y-%m-%d %H:%M:%S.%f %a %Z %z'))
+
+    def testMetrics(self):
+        self.assertEqual(None, ZuluTime.metricsSnapshot())
+        self.assertEqual('', ZuluTime.metricsPrometheus())
+        ZuluTime.configureMetrics()
+        try:
+            for input in ['2012-09-06T23:27:11Z', '2012-09-06T23:27:11+02:00', 'Mon, 20 Nov 1995 21:12:08 +0200', '2012-09-06T23:27:11.4Z ', 1510240477, 'no time']:
+                try:
+                    ZuluTime(input)
+                except TimeError:
+                    pass
+            snapshot = ZuluTime.metricsSnapshot()
+            self.assertEqual({'_scanIso8601': 2, '_parseRfc2822': 1, '_parseEpoch': 1}, snapshot['parsed'])
+            self.assertEqual({'_scanIso8601': 0, '_parseRfc2822': 0, '_parseEpoch': 0}, snapshot['fallThroughs'])
+            self.assertEqual(2, snapshot['timeErrors'])
+            self.assertEqual(['TimeError', '_parseEpoch', '_parseRfc2822', '_scanIso8601'], sorted(snapshot['latency']))
+            latency = snapshot['latency']['_scanIso8601']
+            self.assertEqual((float('inf'), 2), latency['buckets'][-1])
+            self.assertEqual(2, latency['count'])
+            self.assertTrue(0 < latency['sum'] < 1)
+            ZuluTime('Thu, Jan 13 2011 00:59:59 +0100')  # no format detected, the cascade tries 4 parsers first
+            self.assertEqual({'_scanIso8601': 0, '_parseRfc2822': 4, '_parseEpoch': 0}, ZuluTime.metricsSnapshot()['fallThroughs'])
+            text = ZuluTime.metricsPrometheus()
+            self.assertTrue('# TYPE zulutime_parse_seconds histogram\n' in text, text)
+            self.assertTrue('zulutime_parsed_total{parser="_parseRfc2822"} 2\n' in text, text)
+            self.assertTrue('zulutime_time_errors_total 2\n' in text, text)
+            self.assertTrue('zulutime_parse_seconds_bucket{parser="_parseEpoch",le="+Inf"} 1\n' in text, text)
+        finally:
+            ZuluTime.configureMetrics(enabled=False)
+        self.assertEqual(None, ZuluTime.metricsSnapshot())
+
+    def testStrictParsers(self):
+        self.assertEqual('2012-09-06T23:27:11Z', ZuluTime.parseZulu('2012-09-06T23:27:11Z').zulu())
+        self.assertEqual('2012-09-06T23:27:11.403578Z', ZuluTime.parseZulu('2012-09-06T23:27:11.403578Z').zulu(precision=6))
+        self.assertEqual('2012-09-06T21:27:11Z', ZuluTime.parseIso8601('2012-09-06T23:27:11+02:00').zulu())
+        self.assertEqual('2012-09-06T21:27:11 UTC', ZuluTime.parseIso8601('2012-09-06T23:27:11', timezone=Zone('Europe/Amsterdam')).iso8601())
+        self.assertEqual('2012-09-06T00:00:00Z', ZuluTime.parseIso8601('2012-09-06').zulu())
+        self.assertEqual('1995-11-20T19:12:08Z', ZuluTime.parseRfc2822('Mon, 20 Nov 1995 21:12:08 +0200').zulu())
+        self.assertEqual('1994-11-06T08:49:37Z', ZuluTime.parseRfc1123('Sun, 06 Nov 1994 08:49:37 GMT').zulu())
+        for input in ['Sun, 06 Nov 1994 08:49:37 GMT', 'Sunday, 06-Nov-94 08:49:37 GMT', 'Sun Nov  6 08:49:37 1994']:
+            self.assertEqual('1994-11-06T08:49:37Z', ZuluTime.parseHttpDate(input).zulu(), input)
+        self.assertEqual('2012-11-06T08:49:37Z', ZuluTime.parseHttpDate('Tuesday, 06-Nov-12 08:49:37 GMT').zulu())
+        t = ZuluTime('2012-09-06T23:27:11Z')
+        self.assertEqual(t, ZuluTime.parseRfc1123(t.rfc1123()))
+        self.assertEqual(t, ZuluTime.parseZulu(t.zulu()))
+
+    def testStrictParsersRejectOtherFormats(self):
+        for parse, inputs in [
+                (ZuluTime.parseZulu, ['2012-09-06T23:27:11', '2012-09-06 23:27:11Z', '2012-09-06T23:27Z', '2012-02-30T23:27:11Z', '2012-09-06T23:27:60Z', '20120906232711', 1346974031, None]),
+                (ZuluTime.parseIso8601, ['20120906232711', '1346974031', 'Mon, 20 Nov 1995 21:12:08 +0200', '2012-09-06T23:27:11.+01:00', 1346974031]),
+                (ZuluTime.parseRfc2822, ['2012-09-06T23:27:11Z', '1346974031', 'Mon, 40 Nov 1995 21:12:08 +0200', b'Mon, 20 Nov 1995 21:12:08 +0200']),
+                (ZuluTime.parseRfc1123, ['Sun, 06 Nov 1994 08:49:37 +0000', 'Sun, 6 Nov 1994 08:49:37 GMT', 'Sunday, 06-Nov-94 08:49:37 GMT', 'Sun, 31 Nov 1994 08:49:37 GMT']),
+                (ZuluTime.parseHttpDate, ['2012-09-06T23:27:11Z', 'Sun, 06 Nov 1994 08:49:37 CET', 'Sun Nov  6 08:49:37 1994 ', '1346974031']),
+            ]:
+            for input in inputs:
+                self.assertRaises(TimeError, lambda: parse(input))
+
+    def testPickleKeepsTimezoneIdentity(self):
+        amsterdam = Zone('Europe/Amsterdam')
+        for tz in [UTC, Local, _CEST, amsterdam, ZuluTime('2012-09-06T23:27:11+02:00').timezone, ZuluTime('2012-09-06T23:27:11-03:30').timezone]:
+            t = ZuluTime('2012-09-06T23:27:11Z', timezone=tz)
+            copy = loads(dumps(t))
+            self.assertEqual(t, copy)
+            self.assertTrue(copy.timezone is tz, tz)
+        self.assertTrue(_TimeZone.registered['CEST'] is _CEST)
+        self.assertEqual(timedelta(hours=1), loads(dumps(_CEST)).dst(None))
+        self.assertTrue(len(dumps([ZuluTime('2012-09-06T23:27:11Z')] * 100)) < 350)
+
+    def testPickleOfChangedRegisteredTimeZoneDoesNotReplaceIt(self):
+        data = dumps(_TimeZone('CEST', timedelta(hours=2), dst=timedelta(hours=1), register=False)).replace(b'CEST', b'XEST')
+        copy = loads(data)
+        self.assertEqual('XEST', copy.name)
+        self.assertFalse('XEST' in _TimeZone.registered)
+        self.assertTrue(_TimeZone.registered['CEST'] is _CEST)
+
+    def testToBytesAndFromBytes(self):
+        for t in [
+                ZuluTime('2012-09-06T23:27:11Z'),
+                ZuluTime('2012-09-06T23:27:11.403512+02:00'),
+                ZuluTime('1890-01-01T12:00:00-09:30'),
+                ZuluTime('2012-09-06T23:27:11Z', timezone=Local),
+                ZuluTime('2012-09-06T23:27:11Z', timezone=_CEST),
+                ZuluTime('2012-09-06T23:27:11Z', timezone=Zone('Europe/Amsterdam')),
+                ZuluTime('0001-01-01T00:00:00Z'),
+                ZuluTime('9999-12-31T23:59:59.999999Z'),
+            ]:
+            data = t.toBytes()
+            copy = ZuluTime.fromBytes(data)
+            self.assertEqual(t, copy)
+            self.assertTrue(copy.timezone is t.timezone)
+            self.assertEqual(t.display('%Y-%m-%d %H:%M:%S.%f'), copy.display('%Y-%m-%d %H:%M:%S.%f'))
+        self.assertEqual(b'\x00\x04\xc9\x10\xd4\xa3\xb1\xc0\x7f\xff', ZuluTime('2012-09-06T23:27:11Z').toBytes())
+        self.assertEqual(10, len(ZuluTime('2012-09-06T23:27:11+02:00').toBytes()))
+        self.assertEqual(ZuluTime('2012-09-06T23:27:11Z'), ZuluTime.fromBytes(bytearray(ZuluTime('2012-09-06T23:27:11Z').toBytes())))
+
+    def testFromBytesRejectsMalformedData(self):
+        valid = ZuluTime('2012-09-06T23:27:11Z').toBytes()
+        for data in [b'', valid[:9], valid + b'x', valid[:8] + b'\x7f\xfd', valid[:8] + b'\x7f\xfdNo/Such_Zone', valid[:8] + b'\x7f\xfcXYZ', valid[:8] + b'\x05\xa0', b'\x7f' * 8 + b'\x00\x00', 'not bytes', None]:
+            self.assertRaises(TimeError, lambda: ZuluTime.fromBytes(data))
+        self.assertRaises(TimeError, lambda: ZuluTime('2012-09-06T23:27:11Z', timezone=_TimeZone('XYZ', timedelta(hours=3), register=False)).toBytes())
+
+    @skipIf(pyarrow is None, "pyarrow not installed")
+    def testArrow(self):
+        times = [ZuluTime('2012-09-06T23:27:11.5Z'), None, ZuluTime('2013-01-01T00:00:00Z')]
+        array = ZuluTime.toArrow(times)
+        self.assertEqual('UTC', array.type.tz)
+        self.assertEqual('us', array.type.unit)
+        self.assertEqual(1, array.null_count)
+        self.assertEqual(times, ZuluTime.fromArrow(array))
+        amsterdam = Zone('Europe/Amsterdam')
+        result = ZuluTime.fromArrow(ZuluTime.toArrow(times, timezone=amsterdam))
+        self.assertTrue(result[0].timezone is amsterdam)
+        self.assertEqual('+02:00', ZuluTime.toArrow(times, timezone=_CEST).type.tz)
+        self.assertEqual(ZuluTime('2012-09-06T23:27:11Z'), ZuluTime.fromArrow(pyarrow.array([1346974031], type=pyarrow.timestamp('s')))[0])
+
+    @skipIf(pyarrow is not None, "pyarrow installed")
+    def testArrowRequiresPyarrow(self):
+        self.assertRaises(ImportError, lambda: ZuluTime.toArrow([ZuluTime()]))
+        self.assertRaises(ImportError, lambda: ZuluTime.fromArrow(None))
+
+    def testRange(self):
+        amsterdam = Zone('Europe/Amsterdam')
+        self.assertEqual(['2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30'], [t.display('%Y-%m-%d') for t in ZuluTime.range(ZuluTime('2024-01-31T00:00:00Z'), ZuluTime('2024-05-31T00:00:00Z'), '1M')])
+        self.assertEqual(['2024-02-29', '2025-02-28', '2026-02-28', '2027-02-28', '2028-02-29'], [t.display('%Y-%m-%d') for t in ZuluTime.range(ZuluTime('2024-02-29T00:00:00Z'), ZuluTime('2029-01-01T00:00:00Z'), '1y')])
+        days = list(ZuluTime.range(ZuluTime('2024-03-30T00:00:00', timezone=amsterdam), ZuluTime('2024-04-01T12:00:00', timezone=amsterdam), '1d'))
+        self.assertEqual(['2024-03-30 00:00', '2024-03-31 00:00', '2024-04-01 00:00'], [t.display('%Y-%m-%d %H:%M') for t in days])
+        self.assertEqual([86400, 82800], [b.epoch - a.epoch for a, b in zip(days, days[1:])])
+        self.assertTrue(all(t.timezone is amsterdam for t in days))
+        quarters = ZuluTime.range(ZuluTime('2024-03-31T01:30:00Z'), ZuluTime('2024-03-31T02:30:00Z'), '15min', timezone=amsterdam)
+        self.assertEqual(['03:30', '03:45', '04:00', '04:15'], [t.display('%H:%M') for t in quarters])
+        self.assertEqual(['2024-01-01T00:00:00Z', '2024-01-01T12:00:00Z'], [t.zulu() for t in ZuluTime.range(ZuluTime('2024-01-01T00:00:00Z'), ZuluTime('2024-01-02T00:00:00Z'), timedelta(hours=12))])
+        self.assertEqual(['2024-01-01T00:00:00Z', '2024-01-15T00:00:00Z'], [t.zulu() for t in ZuluTime.range(ZuluTime('2024-01-01T00:00:00Z'), ZuluTime('2024-01-16T00:00:00Z'), '2w')])
+        self.assertEqual([], list(ZuluTime.range(ZuluTime('2024-01-01T00:00:00Z'), ZuluTime('2024-01-01T00:00:00Z'))))
+        end = ZuluTime('9999-12-31T23:59:59.999999Z')
+        for step, count in [('1y', 1), ('1M', 12), ('1w', 53), ('1d', 365), ('12h', 730)]:
+            self.assertEqual(count, len(list(ZuluTime.range(ZuluTime('9999-01-01T00:00:00Z'), end, step))), step)
+        minusTwo = ZuluTime('2012-09-06T23:27:11-02:00').timezone
+        self.assertEqual(['9999-12-31T02:00:00Z'], [t.zulu() for t in ZuluTime.range(ZuluTime('9999-12-31T00:00:00', timezone=minusTwo), end, '1d')])
+        for step in ['0d', '-1d', '1m', '1 fortnight', 1, timedelta(0)]:
+            self.assertRaises(ValueError, lambda: list(ZuluTime.range(ZuluTime('2024-01-01T00:00:00Z'), ZuluTime('2024-02-01T00:00:00Z'), step)))
+
     def assertEqualsPointInTime(self, a, b):
         self.assertTrue(a.equalsPointInTime(b), "%s !equalsPointInTime %s" % (a, b))